@@ -3,16 +3,76 @@
 import json
 import os
 
+import saisons
+from depots import DepotEnCache, DepotJson
+from fichiers import ecrire_json, lire_json
+from live_events import broadcaster
+from name_resolver import resolveur_pour_dossier
+from rate_limit import TokenBucketLimiter
+
 # Ajout dans la configuration
 CONFIG = {
     'PASSWORD': "plomberie",
     'DOSSIER_MATCHS': "matchs",
     'DOSSIER_PODIUMS': "podiums",  # Nouveau dossier pour les podiums
-    'SAISON_DEBUT': datetime(2024, 9, 10),
-    'SAISON_FIN': datetime(2025, 4, 29),
-    'ENCODING': 'utf-8'
+    'ENCODING': 'utf-8',
+    'CONNEXION_RAFALE': 5,       # Tentatives de mot de passe permises d'affilée
+    'CONNEXION_PAR_MINUTE': 5    # Puis une nouvelle tentative toutes les 12 secondes
 }
 
+limiteur_connexion = TokenBucketLimiter(
+    capacity=CONFIG['CONNEXION_RAFALE'],
+    refill_per_second=CONFIG['CONNEXION_PAR_MINUTE'] / 60
+)
+
+# Totaux et classements passent par le dépôt commun (depots.py), mis en cache
+# tant que le manifeste de la saison ne change pas.
+depot = DepotEnCache(DepotJson(CONFIG['DOSSIER_MATCHS']))
+
+def saison_courante():
+    """Saison du jour, ou la dernière jouée (bornes de chaque saison dans saisons.SAISONS)"""
+    return saisons.saison_courante(dossier=CONFIG['DOSSIER_MATCHS'])
+
+class StatsManager:
+    """Statistiques des matchs, stockées par saison (voir saisons.py)"""
+    
+    @staticmethod
+    def calendrier_saison(saison=None):
+        """Semaines de la saison avec leurs indicateurs (match joué, annulé, séries)"""
+        return saisons.calendrier(saison or saison_courante(), CONFIG['DOSSIER_MATCHS'])
+    
+    @staticmethod
+    def generer_dates_saison(saison=None):
+        """Dates des mardis de la saison au format AAAA-MM-JJ"""
+        return [jour.date.isoformat() for jour in StatsManager.calendrier_saison(saison)]
+    
+    @staticmethod
+    def lire_match(date_match):
+        """Charge les statistiques d'un match"""
+        if not date_match:
+            return {}
+        return saisons.lire_match(date_match, CONFIG['DOSSIER_MATCHS'])
+    
+    @staticmethod
+    def sauvegarder_match(date_match, stats_match):
+        """Sauvegarde un match dans le dossier de sa saison"""
+        return saisons.sauvegarder_match(date_match, stats_match, CONFIG['DOSSIER_MATCHS'])
+    
+    @staticmethod
+    def calculer_classement_general(saison=None):
+        """Totaux par joueur d'une saison (précalculés, aucun match relu)"""
+        return depot.totaux(saison or saison_courante())
+    
+    @staticmethod
+    def calculer_classement_trie(saison=None):
+        """Classement d'une saison trié par points"""
+        return depot.classement(saison or saison_courante())
+    
+    @staticmethod
+    def calculer_classement_carriere():
+        """Classement de carrière, toutes saisons confondues"""
+        return depot.classement()
+
 class PodiumManager:
     """Gestionnaire des podiums finaux"""
     
@@ -24,29 +84,33 @@ class PodiumManager:
     @staticmethod
     def save_podium(saison, podium_data):
         """Sauvegarde un podium final"""
-        if not os.path.exists(CONFIG['DOSSIER_PODIUMS']):
-            os.makedirs(CONFIG['DOSSIER_PODIUMS'])
-        
         fichier = PodiumManager.get_podium_file(saison)
-        with open(fichier, 'w', encoding=CONFIG['ENCODING']) as f:
-            json.dump(podium_data, f, indent=2, ensure_ascii=False)
+        ecrire_json(fichier, podium_data)
     
     @staticmethod
     def load_podium(saison):
         """Charge un podium final"""
         fichier = PodiumManager.get_podium_file(saison)
         try:
-            if os.path.exists(fichier):
-                with open(fichier, 'r', encoding=CONFIG['ENCODING']) as f:
-                    return json.load(f)
-            return None
+            return lire_json(fichier)
         except (json.JSONDecodeError, Exception):
             return None
     
+    @staticmethod
+    def ligne_podium(form, rang, totaux):
+        """Nom saisi et, à défaut de chiffres saisis, ses totaux de la saison"""
+        nom = form.get(f"{rang}_nom")
+        stats = totaux.get(nom, {})
+        return {
+            "nom": nom,
+            "buts": int(form.get(f"{rang}_buts") or stats.get('buts', 0)),
+            "passes": int(form.get(f"{rang}_passes") or stats.get('passes', 0))
+        }
+    
     @staticmethod
     def get_current_podium():
-        """Retourne le podium de la saison actuelle (2024-2025)"""
-        return PodiumManager.load_podium("2024-2025")
+        """Retourne le podium de la saison courante"""
+        return PodiumManager.load_podium(saison_courante())
 
 # Nouvelle route pour gérer les podiums
 @app.route("/admin/podium", methods=["POST"])
@@ -60,6 +124,7 @@ def admin_podium():
         message = request.form.get("message_podium", "")
         
         # Données du podium
+        totaux = StatsManager.calculer_classement_general(saison)
         podium_data = {
             "saison": saison,
             "statut": statut,
@@ -67,21 +132,8 @@ def admin_podium():
             "message": message,
             "date_creation": datetime.now().isoformat(),
             "podium": {
-                "champion": {
-                    "nom": request.form.get("champion_nom"),
-                    "buts": int(request.form.get("champion_buts", 0)),
-                    "passes": int(request.form.get("champion_passes", 0))
-                },
-                "second": {
-                    "nom": request.form.get("second_nom"),
-                    "buts": int(request.form.get("second_buts", 0)),
-                    "passes": int(request.form.get("second_passes", 0))
-                },
-                "third": {
-                    "nom": request.form.get("third_nom"),
-                    "buts": int(request.form.get("third_buts", 0)),
-                    "passes": int(request.form.get("third_passes", 0))
-                }
+                rang: PodiumManager.ligne_podium(request.form, rang, totaux)
+                for rang in ("champion", "second", "third")
             }
         }
         
@@ -99,10 +151,13 @@ def admin_podium():
 @app.route("/")
 def accueil():
     """Page d'accueil publique - Statistiques pour tous les joueurs"""
-    classement = StatsManager.calculer_classement_trie()
+    saison = request.args.get("saison", saison_courante())
+    if saison not in depot.saisons():
+        saison = saison_courante()
+    classement = StatsManager.calculer_classement_trie(saison)
     
     # Calculer les tops
-    stats_general = StatsManager.calculer_classement_general()
+    stats_general = StatsManager.calculer_classement_general(saison)
     top_buteurs = sorted(stats_general.items(), 
                         key=lambda x: x[1]['buts'], reverse=True)[:3]
     top_passeurs = sorted(stats_general.items(), 
@@ -110,32 +165,44 @@ def accueil():
     top_points = classement[:3]
     
     # Charger le podium personnalisé
-    podium_final = PodiumManager.get_current_podium()
+    podium_final = PodiumManager.load_podium(saison)
     
     return render_template("player.html",
                          classement=classement,
                          top_buteurs=top_buteurs,
                          top_passeurs=top_passeurs,
                          top_points=top_points,
-                         podium_final=podium_final)
+                         podium_final=podium_final,
+                         saison=saison,
+                         saisons=depot.saisons())
 
 # Modifier la route admin pour inclure la gestion du podium
 @app.route("/admin", methods=["GET", "POST"])
 def admin():
     """Interface d'administration"""
-    dates_saison = StatsManager.generer_dates_saison()
+    calendrier = StatsManager.calendrier_saison()
+    dates_saison = [jour.date.isoformat() for jour in calendrier]
     selected_date = request.form.get("date") or (dates_saison[0] if dates_saison else "")
     
     if not session.get("logged_in"):
-        if request.method == "POST" and request.form.get("password") == CONFIG['PASSWORD']:
-            session["logged_in"] = True
-            flash("Connexion réussie !", "success")
-            return redirect("/admin")
-        elif request.method == "POST":
+        if request.method == "POST":
+            autorise, attente = limiteur_connexion.allow(f"ip:{request.remote_addr}")
+            if not autorise:
+                flash(f"Trop de tentatives. Réessayez dans {int(attente) + 1} secondes.", "error")
+                return render_template("admin.html",
+                                     dates=dates_saison,
+                                     calendrier=calendrier,
+                                     selected_date=selected_date,
+                                     logged_in=False), 429
+            if request.form.get("password") == CONFIG['PASSWORD']:
+                session["logged_in"] = True
+                flash("Connexion réussie !", "success")
+                return redirect("/admin")
             flash("Mot de passe incorrect.", "error")
         
         return render_template("admin.html", 
                              dates=dates_saison, 
+                             calendrier=calendrier,
                              selected_date=selected_date,
                              logged_in=False)
     
@@ -149,7 +216,19 @@ def admin():
                 stats_match = traiter_formulaire_manuel(request.form)
             
             if stats_match:
+                # Ramener les noms saisis aux noms canoniques des joueurs
+                ingestion = resolveur_pour_dossier(CONFIG['DOSSIER_MATCHS']).resoudre_stats(stats_match)
+                stats_match = ingestion.stats
+                for r in ingestion.corriges:
+                    flash(f"« {r.saisi} » enregistré sous {r.canonique}", "info")
+                for r in ingestion.ambigus:
+                    flash(f"Nom ambigu « {r.saisi} » ({', '.join(r.candidats)}) : conservé tel quel", "warning")
+                
                 StatsManager.sauvegarder_match(selected_date, stats_match)
+                broadcaster.publish("stats", {
+                    "date": selected_date,
+                    "joueurs": stats_match
+                })
                 date_formatted = datetime.strptime(selected_date, "%Y-%m-%d").strftime("%-d %B %Y")
                 flash(f"Statistiques enregistrées pour le {date_formatted} ({len(stats_match)} joueurs)", "success")
             
@@ -164,6 +243,7 @@ def admin():
     
     return render_template("admin.html",
                          dates=dates_saison,
+                         calendrier=calendrier,
                          selected_date=selected_date,
                          classement=classement[:10],
                          match_courant=match_courant,
@@ -0,0 +1,34 @@
+"""
+Calcul commun des totaux et du classement des joueurs
+Les Plombiers Hockey
+
+Une seule définition des totaux (buts, passes, points, matchs) et de l'ordre
+du classement, quelle que soit la provenance des statistiques : fichiers de
+match JSON, modèles SQLAlchemy ou base MySQL (voir depots.py).
+"""
+
+
+def additionner(totaux, stats_match):
+    """Ajoute {nom: {buts, passes[, matchs]}} aux totaux et les retourne"""
+    for nom, ligne in stats_match.items():
+        joueur = totaux.setdefault(nom, {'buts': 0, 'passes': 0, 'points': 0, 'matchs': 0})
+        buts, passes = int(ligne.get('buts', 0)), int(ligne.get('passes', 0))
+        joueur['buts'] += buts
+        joueur['passes'] += passes
+        joueur['points'] += buts + passes
+        # Une ligne de match compte pour 1; des totaux de saison portent déjà leur nombre.
+        joueur['matchs'] += ligne.get('matchs', 1)
+    return totaux
+
+
+def totaliser(matchs):
+    """Totaux par joueur d'une suite de matchs [(date, {nom: stats})]"""
+    totaux = {}
+    for _, stats_match in matchs:
+        additionner(totaux, stats_match)
+    return totaux
+
+
+def classer(totaux):
+    """[(nom, stats)] triés par points, buts puis nom"""
+    return sorted(totaux.items(), key=lambda x: (-x[1]['points'], -x[1]['buts'], x[0]))
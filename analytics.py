@@ -0,0 +1,273 @@
+"""
+Chronologie des statistiques par match et fenêtres glissantes
+Les Plombiers Hockey
+
+Les matchs d'une saison sont chargés une seule fois dans des tableaux NumPy
+(une ligne par joueur, une colonne par match). Cumuls, moyenne des points
+sur les 5 derniers matchs joués, séquences de matchs avec point et moyennes
+par match sont calculés pour tous les joueurs d'un coup. Le résultat reste
+en cache tant que le manifeste de la saison ne change pas.
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+import saisons
+from fichiers import lire_json
+from name_resolver import cle
+
+FENETRE = 5
+
+Chronologie = namedtuple('Chronologie', [
+    'nom', 'saison', 'version', 'matchs_joues', 'buts', 'passes', 'points',
+    'buts_par_match', 'passes_par_match', 'points_par_match',
+    'plus_longue_sequence', 'sequence_en_cours', 'matchs',
+])
+MatchJoueur = namedtuple('MatchJoueur', ['date', 'buts', 'passes', 'points', 'cumul_points', 'moyenne_glissante'])
+
+
+_version = saisons.version_manifeste
+
+
+def version_saison(saison, dossier=saisons.DOSSIER_MATCHS):
+    """Empreinte courte des matchs d'une saison, tirée du manifeste"""
+    return _version(saisons.manifeste(saison, dossier))
+
+
+class AnalyseSaison:
+    """Tableaux (joueurs x matchs) d'une saison et indicateurs dérivés"""
+
+    def __init__(self, saison, version, dates, joueurs, buts, passes, presents):
+        self.saison = saison
+        self.version = version
+        self.dates = dates
+        self.joueurs = joueurs
+        self.index = {cle(nom): i for i, nom in enumerate(joueurs)}
+        self.buts = buts
+        self.passes = passes
+        self.presents = presents
+        self._calculer()
+
+    @classmethod
+    def charger(cls, saison, dossier=saisons.DOSSIER_MATCHS):
+        entrees = saisons.manifeste(saison, dossier)
+        matchs = [lire_json(os.path.join(saisons.dossier_saison(saison, dossier), e['fichier'])) or {}
+                  for e in entrees]
+        joueurs = sorted({nom for stats in matchs for nom in stats})
+        rangs = {nom: i for i, nom in enumerate(joueurs)}
+
+        forme = (len(joueurs), len(matchs))
+        buts = np.zeros(forme, dtype=np.int32)
+        passes = np.zeros(forme, dtype=np.int32)
+        presents = np.zeros(forme, dtype=bool)
+        for j, stats in enumerate(matchs):
+            for nom, ligne in stats.items():
+                i = rangs[nom]
+                buts[i, j] = int(ligne.get('buts', 0))
+                passes[i, j] = int(ligne.get('passes', 0))
+                presents[i, j] = True
+
+        dates = [e['date'] for e in entrees]
+        return cls(saison, _version(entrees), dates, joueurs, buts, passes, presents)
+
+    def _calculer(self):
+        nb_joueurs, nb_matchs = self.presents.shape
+        points = self.buts + self.passes
+        self.matchs_joues = self.presents.sum(axis=1)
+        joues_ou_un = np.maximum(self.matchs_joues, 1)
+        self.totaux = {'buts': self.buts.sum(axis=1), 'passes': self.passes.sum(axis=1), 'points': points.sum(axis=1)}
+        self.par_match = {stat: total / joues_ou_un for stat, total in self.totaux.items()}
+
+        # Les matchs joués de chaque joueur sont ramenés en tête de ligne, dans
+        # l'ordre chronologique : les fenêtres portent sur ses matchs, pas sur
+        # le calendrier de l'équipe.
+        self.ordre = np.argsort(~self.presents, axis=1, kind='stable')
+        k = np.arange(nb_matchs)
+        self.valide = k < self.matchs_joues[:, None]
+        joues = np.take_along_axis(points, self.ordre, axis=1)
+        self.cumul_points = np.cumsum(joues, axis=1)
+
+        cumul = np.concatenate([np.zeros((nb_joueurs, 1), dtype=self.cumul_points.dtype), self.cumul_points], axis=1)
+        somme = cumul[:, k + 1] - cumul[:, np.maximum(k + 1 - FENETRE, 0)]
+        self.moyenne_glissante = np.where(self.valide, somme / np.minimum(k + 1, FENETRE), np.nan)
+
+        # Longueur de la séquence en cours à chaque match : distance au dernier
+        # match joué sans point.
+        avec_point = (joues > 0) & self.valide
+        dernier_sans_point = np.maximum.accumulate(np.where(avec_point, -1, k), axis=1)
+        sequence = np.where(avec_point, k - dernier_sans_point, 0)
+        if nb_matchs:
+            self.plus_longue_sequence = sequence.max(axis=1)
+            dernier = np.maximum(self.matchs_joues - 1, 0)
+            self.sequence_en_cours = np.where(self.matchs_joues > 0, sequence[np.arange(nb_joueurs), dernier], 0)
+        else:
+            self.plus_longue_sequence = self.sequence_en_cours = np.zeros(nb_joueurs, dtype=int)
+
+    def chronologie(self, nom):
+        """Chronologie d'un joueur (nom comparé sans accents ni ordre des mots), ou None"""
+        i = self.index.get(cle(nom))
+        if i is None:
+            return None
+        n = int(self.matchs_joues[i])
+        colonnes = self.ordre[i, :n]
+        matchs = [
+            MatchJoueur(self.dates[c], int(self.buts[i, c]), int(self.passes[i, c]),
+                        int(self.buts[i, c] + self.passes[i, c]), int(self.cumul_points[i, m]),
+                        round(float(self.moyenne_glissante[i, m]), 2))
+            for m, c in enumerate(colonnes)
+        ]
+        return Chronologie(
+            self.joueurs[i], self.saison, self.version, n,
+            int(self.totaux['buts'][i]), int(self.totaux['passes'][i]), int(self.totaux['points'][i]),
+            round(float(self.par_match['buts'][i]), 2), round(float(self.par_match['passes'][i]), 2),
+            round(float(self.par_match['points'][i]), 2),
+            int(self.plus_longue_sequence[i]), int(self.sequence_en_cours[i]), matchs,
+        )
+
+
+_analyses = {}
+_verrou = threading.Lock()
+
+
+def analyser(saison, dossier=saisons.DOSSIER_MATCHS):
+    """AnalyseSaison en cache, recalculée seulement quand les matchs changent"""
+    entrees = saisons.manifeste(saison, dossier)
+    version = _version(entrees)
+    cache = _analyses.get((dossier, saison))
+    if cache is not None and cache.version == version:
+        return cache
+    if not entrees:
+        # Saison sans match (ou inconnue) : rien à garder, le cache ne
+        # contient que des saisons qui existent sur disque.
+        _analyses.pop((dossier, saison), None)
+        return AnalyseSaison.charger(saison, dossier)
+    with _verrou:
+        cache = _analyses.get((dossier, saison))
+        if cache is None or cache.version != version:
+            cache = AnalyseSaison.charger(saison, dossier)
+            _analyses[(dossier, saison)] = cache
+    return cache
+
+
+def chronologie(nom, saison=None, dossier=saisons.DOSSIER_MATCHS):
+    return analyser(saison or saisons.saison_courante(dossier=dossier), dossier).chronologie(nom)
+
+
+Partenaire = namedtuple('Partenaire', ['nom', 'matchs', 'points', 'points_joueur', 'points_partenaire', 'points_par_match'])
+
+
+class Cooccurrences:
+    """Matrices joueur x joueur d'une saison, tenues à jour match par match.
+
+    ensemble[i, j]    : matchs joués par i et j le même soir (diagonale : matchs joués)
+    points_avec[i, j] : points de i lors de ces matchs
+
+    Un match ajouté ou corrigé ne touche que le bloc de ses joueurs; les
+    lectures sont de simples accès aux cases.
+    """
+
+    def __init__(self, saison):
+        self.saison = saison
+        self.version = None
+        self.joueurs = []
+        self.rangs = {}
+        self.ensemble = np.zeros((0, 0), dtype=np.int32)
+        self.points_avec = np.zeros((0, 0), dtype=np.int32)
+        self.appliques = {}
+        self._partenaires = {}
+
+    def _rang(self, nom):
+        k = cle(nom)
+        i = self.rangs.get(k)
+        if i is None:
+            i = self.rangs[k] = len(self.joueurs)
+            self.joueurs.append(nom)
+            if i >= len(self.ensemble):
+                capacite = max(16, 2 * len(self.ensemble))
+                for attribut in ('ensemble', 'points_avec'):
+                    agrandi = np.zeros((capacite, capacite), dtype=np.int32)
+                    ancien = getattr(self, attribut)
+                    agrandi[:len(ancien), :len(ancien)] = ancien
+                    setattr(self, attribut, agrandi)
+        return i
+
+    def _appliquer(self, stats_match, signe):
+        if not stats_match:
+            return
+        rangs = np.array([self._rang(nom) for nom in stats_match])
+        points = np.array([int(l.get('buts', 0)) + int(l.get('passes', 0)) for l in stats_match.values()])
+        bloc = np.ix_(rangs, rangs)
+        self.ensemble[bloc] += signe
+        self.points_avec[bloc] += signe * points[:, None]
+
+    def synchroniser(self, entrees, dossier_saison):
+        """Applique les matchs ajoutés, modifiés ou retirés depuis la dernière fois"""
+        vus = set()
+        for entree in entrees:
+            fichier = entree['fichier']
+            vus.add(fichier)
+            ancien = self.appliques.get(fichier)
+            if ancien is not None and ancien[0] == entree['sha256']:
+                continue
+            if ancien is not None:
+                self._appliquer(ancien[1], -1)
+            stats = lire_json(os.path.join(dossier_saison, fichier)) or {}
+            self._appliquer(stats, 1)
+            self.appliques[fichier] = (entree['sha256'], stats)
+        for fichier in set(self.appliques) - vus:
+            self._appliquer(self.appliques.pop(fichier)[1], -1)
+        self.version = _version(entrees)
+        self._partenaires = {}
+
+    def _partenaire(self, i, j):
+        matchs = int(self.ensemble[i, j])
+        a, b = int(self.points_avec[i, j]), int(self.points_avec[j, i])
+        return Partenaire(self.joueurs[j], matchs, a + b, a, b, round((a + b) / matchs, 2) if matchs else 0.0)
+
+    # Les lectures prennent _verrou, comme synchroniser() : sous des workers
+    # gthread, _rang() peut agrandir les matrices ou allonger joueurs pendant
+    # qu'un autre thread les lit.
+    def meilleurs_partenaires(self, nom, limite=5):
+        """Coéquipiers classés par points combinés, puis par matchs ensemble"""
+        with _verrou:
+            i = self.rangs.get(cle(nom))
+            if i is None:
+                return None
+            classement = self._partenaires.get(i)
+            if classement is None:
+                n = len(self.joueurs)
+                matchs, combines = self.ensemble[i, :n], self.points_avec[i, :n] + self.points_avec[:n, i]
+                candidats = [j for j in np.lexsort((-matchs, -combines)) if j != i and matchs[j]]
+                classement = self._partenaires[i] = [self._partenaire(i, j) for j in candidats]
+            return classement[:limite]
+
+    def face_a_face(self, nom_a, nom_b):
+        """Matchs joués ensemble et points de chacun ces soirs-là, ou None"""
+        with _verrou:
+            i, j = self.rangs.get(cle(nom_a)), self.rangs.get(cle(nom_b))
+            if i is None or j is None:
+                return None
+            return self._partenaire(i, j)
+
+
+_cooccurrences = {}
+
+
+def cooccurrences(saison, dossier=saisons.DOSSIER_MATCHS):
+    """Cooccurrences de la saison, mises à jour seulement pour les matchs qui ont changé"""
+    entrees = saisons.manifeste(saison, dossier)
+    version = _version(entrees)
+    matrices = _cooccurrences.get((dossier, saison))
+    if matrices is not None and matrices.version == version:
+        return matrices
+    if not entrees:
+        _cooccurrences.pop((dossier, saison), None)
+        return Cooccurrences(saison)
+    with _verrou:
+        matrices = _cooccurrences.setdefault((dossier, saison), Cooccurrences(saison))
+        if matrices.version != version:
+            matrices.synchroniser(entrees, saisons.dossier_saison(saison, dossier))
+    return matrices
@@ -1,29 +1,164 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, send_file
+from flask import Flask, abort, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, Response, stream_with_context, g, session, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user, UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
+from jinja2 import FileSystemBytecodeCache
 import os
+import atexit
 import csv
 import io
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache, wraps
+from sqlalchemy import event, bindparam, text
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+import analytics
+import search_index
+from fichiers import executer_bloquant
+from health_status import HealthMonitor
+from live_events import broadcaster
+from depots import DepotEnCache, DepotSql
+from rate_limit import SharedTokenBucketLimiter, TokenBucketLimiter
+from saisons import DOSSIER_MATCHS, saison_courante, saison_pour_date, saisons_disponibles, saisons_jouees
 
 app = Flask(__name__)
 
+def engine_options(uri):
+    options = {
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+    # In-memory SQLite uses a single-connection pool that takes no sizing.
+    if ':memory:' not in uri:
+        options['pool_size'] = int(os.environ.get('DB_POOL_SIZE', 5))
+        options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+        options['pool_timeout'] = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    return options
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'hockey-stats-secret-key-1994'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///hockey_stats.db'
     if SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
         SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace('postgres://', 'postgresql://', 1)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Applied to every new SQLite connection. WAL lets readers keep going
+    # while an admin write is in progress; busy_timeout makes writers wait
+    # for the lock instead of failing with "database is locked".
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 64 * 1024 * 1024)),
+    }
+    # Optional read replica for public read-only routes: a second Postgres
+    # URL, or locally a read-only SQLite snapshot such as
+    # sqlite:///file:/path/hockey_stats_replica.db?mode=ro&uri=true
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith('postgres://'):
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
+    SQLALCHEMY_BINDS = {
+        'replica': dict(engine_options(DATABASE_REPLICA_URL), url=DATABASE_REPLICA_URL)
+    } if DATABASE_REPLICA_URL else {}
+    # After an admin write, that browser reads from the primary for this long
+    # so it never sees replica lag on its own changes.
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    # Seasons holding matches (database and matchs/) decide the default
+    # season; they are cached per process for this long.
+    SEASONS_CACHE_TTL = int(os.environ.get('SEASONS_CACHE_TTL', 30))
+    LAST_LOGIN_FLUSH_SECONDS = int(os.environ.get('LAST_LOGIN_FLUSH_SECONDS', 60))
+    # Werkzeug hash method; stored hashes using another method are upgraded
+    # on the next successful login. See scripts/bench_password_hash.py.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Login attempts allowed per client IP and per username before waiting
+    # for the bucket to refill (LOGIN_RATE_PER_MINUTE tokens per minute).
+    LOGIN_RATE_BURST = int(os.environ.get('LOGIN_RATE_BURST', 5))
+    LOGIN_RATE_PER_MINUTE = float(os.environ.get('LOGIN_RATE_PER_MINUTE', 5))
+    # The buckets live in this SQLite file so every gunicorn worker spends the
+    # same tokens. An empty value keeps them in memory, per worker: the burst
+    # and rate above then apply to each worker separately.
+    LOGIN_RATE_DB = os.environ.get(
+        'LOGIN_RATE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'rate_limit.db')
+    )
+    # Number of reverse proxies in front of the app (1 on Render), so the
+    # per-IP limit sees the client address rather than the proxy's.
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    # Build steps that only need the app object (scripts/precompile_templates.py)
+    # turn this off so importing app neither creates the database and its
+    # default admin nor connects to the production one.
+    INIT_DATABASE = os.environ.get('INIT_DATABASE', 'true').lower() == 'true'
+    # Compiled templates shared by every worker, filled at deploy by
+    # scripts/precompile_templates.py. An empty value disables the cache.
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR', os.path.join(os.getcwd(), '.jinja_cache'))
+    # /healthz and /readyz answer from a status snapshot refreshed this often
+    # in the background. /readyz also fails once in-flight requests or
+    # checked-out DB connections reach READY_MAX_SATURATION of capacity.
+    HEALTH_REFRESH_SECONDS = float(os.environ.get('HEALTH_REFRESH_SECONDS', 5))
+    READY_MAX_SATURATION = float(os.environ.get('READY_MAX_SATURATION', 0.9))
+    # Requests one worker serves at once, read from the same variables as
+    # gunicorn.conf.py.
+    WORKER_CLASS = os.environ.get('WEB_WORKER_CLASS', 'gevent')
+    WORKER_CAPACITY = {
+        'gevent': int(os.environ.get('WORKER_CONNECTIONS', 1000)),
+        'gthread': int(os.environ.get('WEB_THREADS', 8)),
+    }.get(WORKER_CLASS, 1)
+    # Every visitor keeps an /api/live stream open. Under sync or gthread
+    # workers each one pins a thread, so a handful of fans would starve the
+    # site: streams are only served by cooperative workers unless forced on.
+    LIVE_EVENTS_ENABLED = os.environ.get(
+        'LIVE_EVENTS_ENABLED', str(WORKER_CLASS in ('gevent', 'eventlet'))
+    ).lower() in ('1', 'true', 'yes')
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'static', 'images', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
 app.config.from_object(Config)
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+if app.config['PROXY_FIX_X_FOR']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+if app.config['TEMPLATE_CACHE_DIR']:
+    os.makedirs(app.config['TEMPLATE_CACHE_DIR'], exist_ok=True)
+    app.jinja_options = {**app.jinja_options,
+                         'bytecode_cache': FileSystemBytecodeCache(app.config['TEMPLATE_CACHE_DIR'])}
+
+class RoutingSession(Session):
+    # Reads inside a @read_replica view go to the replica bind; flushes,
+    # pending changes and every other view stay on the primary.
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not (self.new or self.dirty or self.deleted):
+            if has_request_context() and g.get('use_replica') and 'replica' in self._db.engines:
+                return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 
-db = SQLAlchemy(app)
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in app.config['SQLITE_PRAGMAS'].items():
+        try:
+            cursor.execute(f'PRAGMA {name}={value}')
+        except sqlite3.OperationalError:
+            # Switching journal_mode writes to the file, which a read-only
+            # connection (the mode=ro replica snapshot) cannot do; it reads
+            # in whatever mode the file already has.
+            if name != 'journal_mode':
+                raise
+    cursor.close()
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'auth_login'
@@ -61,10 +196,16 @@ class Player(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     is_featured = db.Column(db.Boolean, default=False)
     
-    @property
+    # Hybrids: plain Python on an instance, a SQL expression on the class, so
+    # leaderboards and filters sort and compare in the database.
+    @hybrid_property
     def points(self):
         return self.goals + self.assists
     
+    @points.expression
+    def points(cls):
+        return cls.goals + cls.assists
+    
     @property
     def image_url(self):
         if self.image_filename:
@@ -82,8 +223,11 @@ class Match(db.Model):
     venue = db.Column(db.String(100))
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    season = db.Column(db.String(9))
     
-    @property
+    __table_args__ = (db.Index('ix_matches_season_date', 'season', 'date'),)
+    
+    @hybrid_property
     def result(self):
         if self.our_score > self.opponent_score:
             return 'W'
@@ -92,9 +236,52 @@ class Match(db.Model):
         else:
             return 'T'
     
-    @property
+    @result.expression
+    def result(cls):
+        # Literal (not bound) values so the SQL text matches the expression index.
+        return db.case(
+            (cls.our_score > cls.opponent_score, db.literal_column("'W'")),
+            (cls.our_score < cls.opponent_score, db.literal_column("'L'")),
+            else_=db.literal_column("'T'")
+        )
+    
+    @hybrid_property
     def score_display(self):
         return f"{self.our_score}-{self.opponent_score}"
+    
+    @score_display.expression
+    def score_display(cls):
+        return db.cast(cls.our_score, db.String) + '-' + db.cast(cls.opponent_score, db.String)
+
+# Expression indexes over the hybrids. SQLite and PostgreSQL use them when a
+# query repeats the same expression, which the hybrids guarantee.
+db.Index('ix_players_active_points', Player.is_active, Player.points)
+db.Index('ix_matches_opponent_result', Match.opponent, Match.result)
+db.Index('ix_matches_season_result', Match.season, Match.result)
+
+class TeamRecord(db.Model):
+    # Season record summary, one row per split: 'all', 'home', 'away' and one
+    # 'opponent' row per team faced. Rebuilt from matches whenever a match of
+    # the season changes, so record views never scan the matches table.
+    __tablename__ = 'team_records'
+    season = db.Column(db.String(9), primary_key=True)
+    split = db.Column(db.String(10), primary_key=True)
+    opponent = db.Column(db.String(100), primary_key=True, default='')
+    games = db.Column(db.Integer, default=0)
+    wins = db.Column(db.Integer, default=0)
+    losses = db.Column(db.Integer, default=0)
+    ties = db.Column(db.Integer, default=0)
+    goals_for = db.Column(db.Integer, default=0)
+    goals_against = db.Column(db.Integer, default=0)
+    streak = db.Column(db.String(5))
+    
+    @property
+    def record_display(self):
+        return f"{self.wins}-{self.losses}-{self.ties}"
+    
+    @property
+    def goal_differential(self):
+        return self.goals_for - self.goals_against
 
 class News(db.Model):
     __tablename__ = 'news'
@@ -109,31 +296,393 @@ class News(db.Model):
     featured = db.Column(db.Boolean, default=False)
     author = db.relationship('User', backref=db.backref('news_posts', lazy=True))
 
+# List pages show a few columns per row. They select just those columns into
+# slotted rows, so no Text column (bio, notes, content) is read, no entity is
+# hydrated and nothing lands in the session's identity map. Hybrids are
+# selected as labelled SQL expressions, like the API does.
+class ListRow:
+    __slots__ = ()
+    columns = ()
+
+    def __init__(self, values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def query(cls):
+        return db.session.query(*cls.columns)
+
+    @classmethod
+    def all(cls, query):
+        return [cls(values) for values in query]
+
+    @classmethod
+    def first(cls, query):
+        values = query.first()
+        return cls(values) if values is not None else None
+
+class PlayerRow(ListRow):
+    __slots__ = ('id', 'name', 'position', 'jersey_number', 'goals', 'assists', 'points',
+                 'image_filename', 'is_featured')
+    columns = (Player.id, Player.name, Player.position, Player.jersey_number, Player.goals,
+               Player.assists, Player.points.label('points'), Player.image_filename, Player.is_featured)
+    image_url = Player.image_url
+
+class MatchRow(ListRow):
+    __slots__ = ('id', 'date', 'opponent', 'home_game', 'venue', 'result', 'score_display')
+    columns = (Match.id, Match.date, Match.opponent, Match.home_game, Match.venue,
+               Match.result.label('result'), Match.score_display.label('score_display'))
+
+class NewsRow(ListRow):
+    # preview holds one character past the 150 shown, so templates can tell
+    # whether the post was cut.
+    __slots__ = ('id', 'title', 'excerpt', 'preview', 'created_at', 'published', 'featured', 'author_name')
+    columns = (News.id, News.title, News.excerpt, db.func.substr(News.content, 1, 151).label('preview'),
+               News.created_at, News.published, News.featured, User.username.label('author_name'))
+
+    @classmethod
+    def query(cls):
+        return super().query().outerjoin(User, News.author_id == User.id)
+
+@contextmanager
+def session_scope():
+    # db.session is scoped to the current app context, so every thread or
+    # greenlet already has its own session; this adds commit/rollback so a
+    # failed write never leaks a dirty session back into the pool.
+    try:
+        yield db.session
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    if has_request_context():
+        session['db_written_at'] = time.time()
+
+def read_replica(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        written_at = session.get('db_written_at', 0)
+        g.use_replica = time.time() - written_at > app.config['REPLICA_STICKY_SECONDS']
+        return view(*args, **kwargs)
+    return wrapper
+
+@event.listens_for(Match, 'before_insert')
+@event.listens_for(Match, 'before_update')
+def assign_match_season(mapper, connection, target):
+    target.season = saison_pour_date(target.date)
+
+def refresh_team_records(connection, season):
+    matches, records = Match.__table__, TeamRecord.__table__
+    rows = connection.execute(
+        db.select(
+            matches.c.opponent, matches.c.home_game, db.func.count(),
+            db.func.sum(db.case((Match.result == 'W', 1), else_=0)),
+            db.func.sum(db.case((Match.result == 'L', 1), else_=0)),
+            db.func.sum(db.case((Match.result == 'T', 1), else_=0)),
+            db.func.sum(matches.c.our_score), db.func.sum(matches.c.opponent_score)
+        ).where(matches.c.season == season).group_by(matches.c.opponent, matches.c.home_game)
+    ).all()
+
+    totals = {}
+    for opponent, home_game, *counts in rows:
+        for key in (('all', ''), ('home' if home_game else 'away', ''), ('opponent', opponent)):
+            total = totals.setdefault(key, [0] * 6)
+            for i, value in enumerate(counts):
+                total[i] += value or 0
+
+    # Current streak: walk back from the latest match until the result changes.
+    streak = None
+    results = connection.execute(
+        db.select(Match.result).where(matches.c.season == season)
+        .order_by(matches.c.date.desc(), matches.c.id.desc())
+    ).scalars()
+    for result in results:
+        if streak is None:
+            streak = [result, 0]
+        if result != streak[0]:
+            break
+        streak[1] += 1
+
+    connection.execute(records.delete().where(records.c.season == season))
+    if totals:
+        connection.execute(records.insert(), [
+            {'season': season, 'split': split, 'opponent': opponent,
+             'games': c[0], 'wins': c[1], 'losses': c[2], 'ties': c[3],
+             'goals_for': c[4], 'goals_against': c[5],
+             'streak': f'{streak[0]}{streak[1]}' if split == 'all' and streak else None}
+            for (split, opponent), c in totals.items()
+        ])
+
+@event.listens_for(Match, 'before_update')
+def remember_previous_season(mapper, connection, target):
+    # A match moved to another season must also refresh the one it left. The
+    # old value is often expired after a commit, so read it before the UPDATE.
+    if db.inspect(target).attrs.date.history.has_changes():
+        matches = Match.__table__
+        target._previous_season = connection.scalar(
+            db.select(matches.c.season).where(matches.c.id == target.id))
+
+@event.listens_for(Match, 'after_insert')
+@event.listens_for(Match, 'after_update')
+@event.listens_for(Match, 'after_delete')
+def update_team_records(mapper, connection, target):
+    _played_seasons[1] = None
+    seasons = {target.season, target.__dict__.pop('_previous_season', None)}
+    for season in seasons - {None}:
+        refresh_team_records(connection, season)
+
+def team_record(season):
+    rows = TeamRecord.query.filter_by(season=season).all()
+    splits = {row.split: row for row in rows if row.split != 'opponent'}
+    opponents = sorted((row for row in rows if row.split == 'opponent'),
+                       key=lambda row: (-row.games, row.opponent))
+    return {'overall': splits.get('all'), 'home': splits.get('home'),
+            'away': splits.get('away'), 'opponents': opponents}
+
+SEASON_PATTERN = re.compile(r'^\d{4}-\d{4}$')
+MATCH_RESULTS = ('W', 'L', 'T')
+
+# [expires_at, seasons]; dropped by update_team_records when a match is written
+# by this process, other workers pick the change up within SEASONS_CACHE_TTL.
+_played_seasons = [0.0, None]
+
+def played_seasons():
+    expires_at, seasons = _played_seasons
+    if seasons is None or expires_at <= time.monotonic():
+        in_database = {s for (s,) in db.session.query(Match.season).distinct() if s}
+        seasons = frozenset(in_database | set(saisons_jouees()))
+        _played_seasons[:] = [time.monotonic() + app.config['SEASONS_CACHE_TTL'], seasons]
+    return seasons
+
+def current_season():
+    # Today's season, or the latest one played until its first match.
+    return saison_courante(played_seasons())
+
+def known_seasons():
+    return played_seasons() | set(saisons_disponibles()) | {current_season()}
+
+def selected_season():
+    # The season keys the analytics caches, so only seasons that exist are
+    # accepted; any other well-formed value is a 404 rather than a new entry.
+    season = request.args.get('season', '')
+    if not SEASON_PATTERN.match(season):
+        return current_season()
+    if season not in known_seasons():
+        if request.path.startswith('/api/'):
+            raise ApiError('Unknown season', 404)
+        abort(404)
+    return season
+
+def filter_matches(query):
+    # ?result=L&opponent=Vanier -> every loss against Vanier, in SQL.
+    result = request.args.get('result', '').upper()
+    if result in MATCH_RESULTS:
+        query = query.filter(Match.result == result)
+    opponent = request.args.get('opponent', '').strip()
+    if opponent:
+        query = query.filter(Match.opponent == opponent)
+    return query
+
+# Logged-in admins hit load_user on every request. The user's columns are
+# cached per process for USER_CACHE_TTL seconds and rebuilt into a session
+# object without a query; any ORM update or delete of a User drops its entry.
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+
+def _user_columns(user):
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    with _user_cache_lock:
+        _user_cache.pop(target.id, None)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    now = time.monotonic()
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+    if cached and cached[0] > now:
+        user = User(**cached[1])
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        with _user_cache_lock:
+            _user_cache[user_id] = (now + app.config['USER_CACHE_TTL'], _user_columns(user))
+    return user
+
+# last_login is informational, so logins are buffered and written in one
+# batched UPDATE instead of a commit inside every /auth/login request.
+_pending_logins = {}
+_pending_logins_lock = threading.Lock()
+_last_login_flush = time.monotonic()
+
+def record_login(user_id):
+    with _pending_logins_lock:
+        _pending_logins[user_id] = datetime.utcnow()
+
+def flush_last_logins(force=False):
+    global _last_login_flush
+    with _pending_logins_lock:
+        due = time.monotonic() - _last_login_flush >= app.config['LAST_LOGIN_FLUSH_SECONDS']
+        if not _pending_logins or not (force or due):
+            return 0
+        pending = list(_pending_logins.items())
+        _pending_logins.clear()
+        _last_login_flush = time.monotonic()
+
+    users = User.__table__
+    statement = users.update().where(users.c.id == bindparam('user_id')).values(last_login=bindparam('logged_in_at'))
+    with db.engine.begin() as connection:
+        connection.execute(statement, [{'user_id': user_id, 'logged_in_at': at} for user_id, at in pending])
+    return len(pending)
+
+@app.teardown_request
+def flush_pending_logins(exc):
+    try:
+        flush_last_logins()
+    except Exception as e:
+        app.logger.warning(f'Could not flush last_login updates: {e}')
+
+@atexit.register
+def flush_logins_at_exit():
+    try:
+        with app.app_context():
+            flush_last_logins(force=True)
+    except Exception:
+        pass
+
+# Search index upkeep: rows are (re)indexed in the same transaction that
+# writes them. Inactive players and unpublished news are kept out. Updates
+# that leave every indexed column alone (stats, views) skip the index.
+PLAYER_SEARCH_FIELDS = ('name', 'hometown', 'bio', 'is_active')
+NEWS_SEARCH_FIELDS = ('title', 'excerpt', 'content', 'published')
+
+def search_fields_changed(target, fields):
+    # On insert every set column has history too, so new rows are indexed.
+    attrs = db.inspect(target).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+@event.listens_for(Player, 'after_insert')
+@event.listens_for(Player, 'after_update')
+def index_player(mapper, connection, target):
+    if not search_fields_changed(target, PLAYER_SEARCH_FIELDS):
+        return
+    if target.is_active is False:
+        search_index.retirer(connection, 'player', target.id)
+    else:
+        search_index.indexer(connection, 'player', target.id, target.name, target.hometown, target.bio)
+
+@event.listens_for(News, 'after_insert')
+@event.listens_for(News, 'after_update')
+def index_news(mapper, connection, target):
+    if not search_fields_changed(target, NEWS_SEARCH_FIELDS):
+        return
+    if target.published is False:
+        search_index.retirer(connection, 'news', target.id)
+    else:
+        search_index.indexer(connection, 'news', target.id, target.title, target.excerpt, target.content)
+
+@event.listens_for(Player, 'after_delete')
+def unindex_player(mapper, connection, target):
+    search_index.retirer(connection, 'player', target.id)
+
+@event.listens_for(News, 'after_delete')
+def unindex_news(mapper, connection, target):
+    search_index.retirer(connection, 'news', target.id)
+
+def rebuild_search_index():
+    with db.engine.begin() as connection:
+        search_index.vider(connection)
+        for player in Player.query.filter(Player.is_active != False):
+            search_index.indexer(connection, 'player', player.id, player.name, player.hometown, player.bio)
+        for news in News.query.filter(News.published != False):
+            search_index.indexer(connection, 'news', news.id, news.title, news.excerpt, news.content)
+
+def search_results(query, limit=40):
+    hits = search_index.rechercher(db.session.connection(), query, limite=limit)
+    player_ids = [ref_id for kind, ref_id in hits if kind == 'player']
+    news_ids = [ref_id for kind, ref_id in hits if kind == 'news']
+    players = {p.id: p for p in Player.query.filter(Player.id.in_(player_ids))} if player_ids else {}
+    news_posts = {n.id: n for n in News.query.filter(News.id.in_(news_ids))} if news_ids else {}
+    return ([players[i] for i in player_ids if i in players],
+            [news_posts[i] for i in news_ids if i in news_posts])
+
+def hash_password(password):
+    return generate_password_hash(password, method=app.config['PASSWORD_HASH_METHOD'])
+
+@lru_cache(maxsize=None)
+def password_hash_prefix(method):
+    # Werkzeug expands short names ('scrypt' -> 'scrypt:32768:8:1'), so the
+    # expected prefix is taken from a real hash rather than from config.
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+def password_needs_rehash(password_hash):
+    return password_hash.split('$', 1)[0] != password_hash_prefix(app.config['PASSWORD_HASH_METHOD'])
+
+if app.config['LOGIN_RATE_DB']:
+    login_limiter = SharedTokenBucketLimiter(
+        app.config['LOGIN_RATE_DB'],
+        capacity=app.config['LOGIN_RATE_BURST'],
+        refill_per_second=app.config['LOGIN_RATE_PER_MINUTE'] / 60
+    )
+else:
+    login_limiter = TokenBucketLimiter(
+        capacity=app.config['LOGIN_RATE_BURST'],
+        refill_per_second=app.config['LOGIN_RATE_PER_MINUTE'] / 60
+    )
+
+def login_attempt_allowed(username=None):
+    # Checked before any hash is computed: under attack, hash work is capped
+    # at LOGIN_RATE_PER_MINUTE per IP and per targeted username.
+    keys = [f'ip:{request.remote_addr}']
+    if username:
+        keys.append(f'user:{username.lower()}')
+    retry_after = 0
+    for key in keys:
+        allowed, wait = login_limiter.allow(key)
+        if not allowed:
+            retry_after = max(retry_after, wait)
+    return retry_after == 0, int(retry_after) + 1
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+# Career totals go through the same repository layer as agent_stats_hockey.py
+# and the export scripts (depots.py), on the app's own engine, and are
+# recomputed only when the players table changes.
+_stats_depot = []
+
+def stats_depot():
+    if not _stats_depot:
+        _stats_depot.append(DepotEnCache(DepotSql(db.engine)))
+    return _stats_depot[0]
+
 @app.route('/')
+@read_replica
 def index():
+    # Resolved outside the try: an unknown season is a 404, not an empty page.
+    season = selected_season()
     try:
-        featured_players = Player.query.filter_by(is_featured=True, is_active=True).all()
-        recent_news = News.query.filter_by(published=True).order_by(News.created_at.desc()).limit(5).all()
-        recent_matches = Match.query.order_by(Match.date.desc()).limit(5).all()
+        featured_players = PlayerRow.all(PlayerRow.query().filter(
+            Player.is_featured == True, Player.is_active == True))
+        recent_news = NewsRow.all(NewsRow.query().filter(News.published == True)
+                                  .order_by(News.created_at.desc()).limit(5))
+        recent_matches = MatchRow.all(MatchRow.query().filter(Match.season == season)
+                                      .order_by(Match.date.desc()).limit(5))
         
-        active_players = Player.query.filter_by(is_active=True).all()
-        total_goals = sum(p.goals for p in active_players)
-        total_assists = sum(p.assists for p in active_players)
-        total_points = total_goals + total_assists
-        top_scorer = Player.query.filter_by(is_active=True).order_by(Player.goals.desc()).first()
+        career = stats_depot().totaux()
+        top_scorer = min(career.items(), key=lambda item: (-item[1]['buts'], item[0]), default=None)
         
         team_stats = {
-            'total_goals': total_goals,
-            'total_assists': total_assists,
-            'total_points': total_points,
-            'top_scorer': top_scorer
+            'total_goals': sum(stats['buts'] for stats in career.values()),
+            'total_assists': sum(stats['passes'] for stats in career.values()),
+            'total_points': sum(stats['points'] for stats in career.values()),
+            'top_scorer': top_scorer and {'name': top_scorer[0], 'goals': top_scorer[1]['buts']}
         }
     except Exception as e:
         featured_players = []
@@ -150,23 +699,73 @@ def index():
                          featured_players=featured_players,
                          recent_news=recent_news,
                          recent_matches=recent_matches,
-                         team_stats=team_stats)
+                         team_stats=team_stats,
+                         live_events=app.config['LIVE_EVENTS_ENABLED'])
 
 @app.route('/player/<int:player_id>')
+@read_replica
 def player_detail(player_id):
     player = Player.query.get_or_404(player_id)
-    return render_template('player_detail.html', player=player)
+    season = selected_season()
+    timeline = analytics.chronologie(player.name, season)
+    linemates = analytics.cooccurrences(season).meilleurs_partenaires(player.name)
+    return render_template('player_detail.html', player=player, season=season,
+                         timeline=timeline, linemates=linemates)
+
+@app.route('/head-to-head')
+@read_replica
+def head_to_head():
+    season = selected_season()
+    players = Player.query.filter_by(is_active=True).order_by(Player.name).all()
+    first = db.session.get(Player, request.args.get('a', type=int) or 0)
+    second = db.session.get(Player, request.args.get('b', type=int) or 0)
+    result = None
+    if first and second:
+        result = analytics.cooccurrences(season).face_a_face(first.name, second.name)
+    return render_template('head_to_head.html', players=players, season=season,
+                         first=first, second=second, result=result)
+
+@app.route('/search')
+@read_replica
+def search():
+    query = request.args.get('q', '').strip()
+    players, news_posts = search_results(query) if query else ([], [])
+    return render_template('search.html', query=query, players=players, news_posts=news_posts)
+
+@app.route('/api/search')
+@read_replica
+def api_search():
+    query = request.args.get('q', '').strip()
+    if not query:
+        raise ApiError('q is required')
+    players, news_posts = search_results(query, limit=api_limit())
+    return api_response({
+        'players': [{'id': p.id, 'name': p.name, 'position': p.position, 'hometown': p.hometown}
+                    for p in players],
+        'news': [{'id': n.id, 'title': n.title, 'excerpt': n.excerpt,
+                  'created_at': n.created_at.isoformat()} for n in news_posts],
+    })
 
 @app.route('/auth/login', methods=['GET', 'POST'])
 def auth_login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
+        allowed, retry_after = login_attempt_allowed(username)
+        if not allowed:
+            flash(f'Too many login attempts. Try again in {retry_after} seconds.', 'error')
+            response = app.make_response((render_template('auth/login.html'), 429))
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        
         user = User.query.filter_by(username=username).first()
         
         if user and check_password_hash(user.password_hash, password):
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            if password_needs_rehash(user.password_hash):
+                with session_scope():
+                    user.password_hash = hash_password(password)
+            login_limiter.reset(f'user:{username.lower()}')
+            record_login(user.id)
             login_user(user, remember=True)
             flash('Login successful!', 'success')
             return redirect(url_for('admin_dashboard'))
@@ -186,20 +785,23 @@ def auth_logout():
 @login_required
 def admin_dashboard():
     total_players = Player.query.filter_by(is_active=True).count()
-    total_matches = Match.query.count()
+    season = selected_season()
+    total_matches = Match.query.filter_by(season=season).count()
     total_news = News.query.filter_by(published=True).count()
-    recent_matches = Match.query.order_by(Match.date.desc()).limit(5).all()
+    recent_matches = Match.query.filter_by(season=season).order_by(Match.date.desc()).limit(5).all()
     
     return render_template('admin/dashboard.html',
                          total_players=total_players,
                          total_matches=total_matches,
                          total_news=total_news,
-                         recent_matches=recent_matches)
+                         recent_matches=recent_matches,
+                         record=team_record(season),
+                         season=season)
 
 @app.route('/admin/players')
 @login_required
 def admin_players():
-    players = Player.query.all()
+    players = PlayerRow.all(PlayerRow.query().order_by(Player.id))
     return render_template('admin/players.html', players=players)
 
 @app.route('/admin/players/add', methods=['GET', 'POST'])
@@ -213,7 +815,7 @@ def admin_add_player():
                 filename = secure_filename(file.filename)
                 timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S_')
                 image_filename = timestamp + filename
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], image_filename))
+                executer_bloquant(file.save, os.path.join(app.config['UPLOAD_FOLDER'], image_filename))
         
         player = Player(
             name=request.form['name'],
@@ -233,8 +835,8 @@ def admin_add_player():
             is_featured='is_featured' in request.form
         )
         
-        db.session.add(player)
-        db.session.commit()
+        with session_scope() as db_session:
+            db_session.add(player)
         flash('Player added successfully!', 'success')
         return redirect(url_for('admin_players'))
     
@@ -248,18 +850,23 @@ def admin_delete_player(player_id):
     if player.image_filename:
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], player.image_filename)
         if os.path.exists(file_path):
-            os.remove(file_path)
+            executer_bloquant(os.remove, file_path)
     
-    db.session.delete(player)
-    db.session.commit()
+    with session_scope() as db_session:
+        db_session.delete(player)
     flash('Player deleted successfully!', 'success')
     return redirect(url_for('admin_players'))
 
 @app.route('/admin/matches')
 @login_required
 def admin_matches():
-    matches = Match.query.order_by(Match.date.desc()).all()
-    return render_template('admin/matches.html', matches=matches)
+    season = selected_season()
+    matches = MatchRow.all(filter_matches(MatchRow.query().filter(Match.season == season))
+                           .order_by(Match.date.desc()))
+    seasons = sorted(known_seasons(), reverse=True)
+    return render_template('admin/matches.html', matches=matches,
+                         season=season, seasons=seasons,
+                         result=request.args.get('result', '').upper())
 
 @app.route('/admin/matches/add', methods=['GET', 'POST'])
 @login_required
@@ -275,8 +882,17 @@ def admin_add_match():
             notes=request.form['notes']
         )
         
-        db.session.add(match)
-        db.session.commit()
+        with session_scope() as db_session:
+            db_session.add(match)
+        broadcaster.publish('match', {
+            'id': match.id,
+            'date': match.date.isoformat(),
+            'opponent': match.opponent,
+            'home_game': match.home_game,
+            'our_score': match.our_score,
+            'opponent_score': match.opponent_score,
+            'result': match.result
+        })
         flash('Match added successfully!', 'success')
         return redirect(url_for('admin_matches'))
     
@@ -285,7 +901,7 @@ def admin_add_match():
 @app.route('/admin/news')
 @login_required
 def admin_news():
-    news_posts = News.query.order_by(News.created_at.desc()).all()
+    news_posts = NewsRow.all(NewsRow.query().order_by(News.created_at.desc()))
     return render_template('admin/news.html', news_posts=news_posts)
 
 @app.route('/admin/news/add', methods=['GET', 'POST'])
@@ -301,8 +917,8 @@ def admin_add_news():
             featured='featured' in request.form
         )
         
-        db.session.add(news_post)
-        db.session.commit()
+        with session_scope() as db_session:
+            db_session.add(news_post)
         flash('News post added successfully!', 'success')
         return redirect(url_for('admin_news'))
     
@@ -310,48 +926,477 @@ def admin_add_news():
 
 @app.route('/admin/export/players')
 @login_required
+@read_replica
 def admin_export_players():
-    players = Player.query.filter_by(is_active=True).all()
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
+    players = Player.query.filter_by(is_active=True).order_by(Player.id).yield_per(100)
     
-    writer.writerow([
-        'Name', 'Position', 'Jersey #', 'Age', 'Height', 'Weight',
-        'Hometown', 'Goals', 'Assists', 'Points', 'PIM', 'Games Played', '+/-'
-    ])
-    
-    for player in players:
+    # Streamed row by row so a slow download never holds the whole file in
+    # memory, and async/threaded workers keep serving other requests meanwhile.
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        
         writer.writerow([
-            player.name, player.position, player.jersey_number,
-            player.age, player.height, player.weight, player.hometown,
-            player.goals, player.assists, player.points,
-            player.penalty_minutes, player.games_played, player.plus_minus
+            'Name', 'Position', 'Jersey #', 'Age', 'Height', 'Weight',
+            'Hometown', 'Goals', 'Assists', 'Points', 'PIM', 'Games Played', '+/-'
         ])
+        
+        for player in players:
+            writer.writerow([
+                player.name, player.position, player.jersey_number,
+                player.age, player.height, player.weight, player.hometown,
+                player.goals, player.assists, player.points,
+                player.penalty_minutes, player.games_played, player.plus_minus
+            ])
+            yield output.getvalue().encode('utf-8')
+            output.seek(0)
+            output.truncate(0)
+        
+        yield output.getvalue().encode('utf-8')
     
-    output.seek(0)
-    output_bytes = io.BytesIO()
-    output_bytes.write(output.getvalue().encode('utf-8'))
-    output_bytes.seek(0)
-    
-    return send_file(
-        output_bytes,
+    filename = f'players_stats_{datetime.now().strftime("%Y%m%d")}.csv'
+    return Response(
+        stream_with_context(generate()),
         mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'players_stats_{datetime.now().strftime("%Y%m%d")}.csv'
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
     return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
 
+# Read-only JSON API. Each resource lists the columns a client may ask for
+# with ?fields=; rows come back as plain tuples and are serialized in one pass.
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 200
+
+API_FIELDS = {
+    'players': {
+        'id': Player.id,
+        'name': Player.name,
+        'position': Player.position,
+        'jersey_number': Player.jersey_number,
+        'age': Player.age,
+        'height': Player.height,
+        'weight': Player.weight,
+        'hometown': Player.hometown,
+        'goals': Player.goals,
+        'assists': Player.assists,
+        'points': Player.points.label('points'),
+        'penalty_minutes': Player.penalty_minutes,
+        'games_played': Player.games_played,
+        'plus_minus': Player.plus_minus,
+        'image_filename': Player.image_filename,
+        'bio': Player.bio,
+        'is_featured': Player.is_featured,
+        'updated_at': Player.updated_at,
+    },
+    'matches': {
+        'id': Match.id,
+        'date': Match.date,
+        'opponent': Match.opponent,
+        'home_game': Match.home_game,
+        'our_score': Match.our_score,
+        'opponent_score': Match.opponent_score,
+        'venue': Match.venue,
+        'notes': Match.notes,
+        'season': Match.season,
+        'result': Match.result.label('result'),
+        'score': Match.score_display.label('score'),
+    },
+}
+
+API_DEFAULT_FIELDS = {
+    'players': ('id', 'name', 'position', 'jersey_number', 'goals', 'assists', 'points', 'games_played'),
+    'matches': ('id', 'date', 'season', 'opponent', 'home_game', 'our_score', 'opponent_score', 'result', 'venue'),
+    'standings': ('id', 'name', 'goals', 'assists', 'points', 'games_played'),
+}
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+@app.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify({'error': error.message}), error.status
+
+def api_fields(resource, defaults):
+    available = API_FIELDS[resource]
+    requested = request.args.get('fields')
+    if not requested:
+        return list(defaults)
+    names = []
+    for name in requested.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in available:
+            raise ApiError(f"Unknown field '{name}' for {resource}")
+        if name not in names:
+            names.append(name)
+    if not names:
+        raise ApiError('fields must name at least one column')
+    return names
+
+def api_ids():
+    raw = request.args.get('ids')
+    if not raw:
+        return None
+    try:
+        ids = sorted({int(value) for value in raw.split(',') if value.strip()})
+    except ValueError:
+        raise ApiError('ids must be a comma-separated list of integers')
+    if len(ids) > API_MAX_LIMIT:
+        raise ApiError(f'At most {API_MAX_LIMIT} ids per request')
+    return ids
+
+def api_limit():
+    try:
+        limit = int(request.args.get('limit', API_DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError('limit must be an integer')
+    return max(1, min(limit, API_MAX_LIMIT))
+
+def api_cursor(*converters):
+    raw = request.args.get('after')
+    if not raw:
+        return None
+    parts = raw.split(':')
+    if len(parts) != len(converters):
+        raise ApiError('Invalid pagination cursor')
+    try:
+        return tuple(convert(part) for convert, part in zip(converters, parts))
+    except ValueError:
+        raise ApiError('Invalid pagination cursor')
+
+def api_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+def api_query(resource, names, keys):
+    # Pagination keys are always selected so the next cursor can be built,
+    # but only the requested fields are serialized.
+    columns = API_FIELDS[resource]
+    extra = [key for key in keys if key not in names]
+    selected = names + extra
+    return db.session.query(*[columns[name] for name in selected]), selected
+
+def api_serialize(rows, names, width):
+    return [
+        {name: api_value(value) for name, value in zip(names, row[:width])}
+        for row in rows
+    ]
+
+def api_response(payload):
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def api_page(query, names, width, limit, cursor_of):
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = cursor_of(rows[-1]) if has_more and rows else None
+    return {'data': api_serialize(rows, names, width), 'next': next_cursor}
+
+@app.route('/api/players')
+@read_replica
+def api_players():
+    names = api_fields('players', API_DEFAULT_FIELDS['players'])
+    query, selected = api_query('players', names, ['id'])
+    width, key_index = len(names), selected.index('id')
+    query = query.filter(Player.is_active == True)
+
+    ids = api_ids()
+    if ids is not None:
+        rows = query.filter(Player.id.in_(ids)).order_by(Player.id).all()
+        return api_response({'data': api_serialize(rows, names, width), 'next': None})
+
+    cursor = api_cursor(int)
+    if cursor:
+        query = query.filter(Player.id > cursor[0])
+    query = query.order_by(Player.id)
+    return api_response(api_page(query, names, width, api_limit(),
+                                 lambda row: str(row[key_index])))
+
+@app.route('/api/players/<int:player_id>')
+@read_replica
+def api_player(player_id):
+    names = api_fields('players', API_FIELDS['players'])
+    query, _ = api_query('players', names, [])
+    row = query.filter(Player.id == player_id, Player.is_active == True).first()
+    if row is None:
+        return jsonify({'error': 'Player not found'}), 404
+    return api_response(api_serialize([row], names, len(names))[0])
+
+@app.route('/api/players/<int:player_id>/timeline')
+@read_replica
+def api_player_timeline(player_id):
+    player = db.session.get(Player, player_id)
+    if player is None or not player.is_active:
+        return jsonify({'error': 'Player not found'}), 404
+    season = selected_season()
+    timeline = analytics.chronologie(player.name, season)
+    if timeline is None:
+        raise ApiError(f'No game stats for this player in {season}', 404)
+    return api_response({
+        'id': player.id,
+        'name': player.name,
+        'season': season,
+        'version': timeline.version,
+        'games_played': timeline.matchs_joues,
+        'goals': timeline.buts,
+        'assists': timeline.passes,
+        'points': timeline.points,
+        'per_game': {
+            'goals': timeline.buts_par_match,
+            'assists': timeline.passes_par_match,
+            'points': timeline.points_par_match,
+        },
+        'longest_point_streak': timeline.plus_longue_sequence,
+        'current_point_streak': timeline.sequence_en_cours,
+        'games': [
+            {'date': game.date, 'goals': game.buts, 'assists': game.passes, 'points': game.points,
+             'cumulative_points': game.cumul_points, f'rolling_{analytics.FENETRE}_points': game.moyenne_glissante}
+            for game in timeline.matchs
+        ],
+    })
+
+def api_pairing(pairing):
+    return {
+        'name': pairing.nom,
+        'games_together': pairing.matchs,
+        'combined_points': pairing.points,
+        'player_points': pairing.points_joueur,
+        'linemate_points': pairing.points_partenaire,
+        'combined_points_per_game': pairing.points_par_match,
+    }
+
+@app.route('/api/players/<int:player_id>/linemates')
+@read_replica
+def api_player_linemates(player_id):
+    player = db.session.get(Player, player_id)
+    if player is None or not player.is_active:
+        return jsonify({'error': 'Player not found'}), 404
+    season = selected_season()
+    linemates = analytics.cooccurrences(season).meilleurs_partenaires(player.name, api_limit())
+    if linemates is None:
+        raise ApiError(f'No game stats for this player in {season}', 404)
+    return api_response({'id': player.id, 'name': player.name, 'season': season,
+                         'data': [api_pairing(p) for p in linemates]})
+
+@app.route('/api/head-to-head')
+@read_replica
+def api_head_to_head():
+    ids = [request.args.get(key, type=int) for key in ('a', 'b')]
+    if None in ids:
+        raise ApiError('a and b must be player ids')
+    first, second = (db.session.get(Player, player_id) for player_id in ids)
+    if first is None or second is None or not (first.is_active and second.is_active):
+        return jsonify({'error': 'Player not found'}), 404
+    season = selected_season()
+    result = analytics.cooccurrences(season).face_a_face(first.name, second.name)
+    if result is None:
+        raise ApiError(f'No game stats for both players in {season}', 404)
+    return api_response({
+        'season': season,
+        'a': {'id': first.id, 'name': first.name, 'points': result.points_joueur},
+        'b': {'id': second.id, 'name': second.name, 'points': result.points_partenaire},
+        'games_together': result.matchs,
+        'combined_points': result.points,
+        'combined_points_per_game': result.points_par_match,
+    })
+
+@app.route('/api/matches')
+@read_replica
+def api_matches():
+    names = api_fields('matches', API_DEFAULT_FIELDS['matches'])
+    query, selected = api_query('matches', names, ['date', 'id'])
+    width = len(names)
+    date_index, id_index = selected.index('date'), selected.index('id')
+
+    ids = api_ids()
+    if ids is not None:
+        rows = query.filter(Match.id.in_(ids)).order_by(Match.date.desc(), Match.id.desc()).all()
+        return api_response({'data': api_serialize(rows, names, width), 'next': None})
+
+    # One season by default; ?season=all spans the whole archive.
+    if request.args.get('season') != 'all':
+        query = query.filter(Match.season == selected_season())
+    query = filter_matches(query)
+
+    cursor = api_cursor(lambda value: datetime.strptime(value, '%Y-%m-%d').date(), int)
+    if cursor:
+        cursor_date, cursor_id = cursor
+        query = query.filter(db.or_(
+            Match.date < cursor_date,
+            db.and_(Match.date == cursor_date, Match.id < cursor_id)
+        ))
+    query = query.order_by(Match.date.desc(), Match.id.desc())
+    return api_response(api_page(query, names, width, api_limit(),
+                                 lambda row: f'{row[date_index].isoformat()}:{row[id_index]}'))
+
+@app.route('/api/standings')
+@read_replica
+def api_standings():
+    names = api_fields('players', API_DEFAULT_FIELDS['standings'])
+    query, selected = api_query('players', names, ['points', 'id'])
+    width = len(names)
+    points_index, id_index = selected.index('points'), selected.index('id')
+    points = Player.points
+    query = query.filter(Player.is_active == True)
+
+    cursor = api_cursor(int, int)
+    if cursor:
+        cursor_points, cursor_id = cursor
+        query = query.filter(db.or_(
+            points < cursor_points,
+            db.and_(points == cursor_points, Player.id > cursor_id)
+        ))
+    query = query.order_by(points.desc(), Player.id)
+    return api_response(api_page(query, names, width, api_limit(),
+                                 lambda row: f'{row[points_index]}:{row[id_index]}'))
+
+@app.route('/api/live')
+def api_live():
+    if not app.config['LIVE_EVENTS_ENABLED']:
+        # EventSource gives up on a non-200 answer instead of reconnecting.
+        return jsonify({'error': 'Live events need an async worker (WEB_WORKER_CLASS=gevent)'}), 503
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        broadcaster.stream(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# Health probes. The checks run in the monitor's background thread; the
+# probes only read its snapshot plus in-memory counters, so Render can probe
+# as often as it likes without a query or a page render.
+def check_database():
+    with app.app_context():
+        pool = pool_status()
+        if pool and pool['saturation'] >= 1:
+            # Every connection is busy, which shows the database answers; a
+            # ping would only wait pool_timeout and make the snapshot stale.
+            return {'skipped': 'pool exhausted'}
+        for name, engine in db.engines.items():
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+        return {'engines': sorted(str(name or 'primary') for name in db.engines)}
+
+def check_matches_folder():
+    if not os.access(DOSSIER_MATCHS, os.R_OK | os.X_OK):
+        raise OSError(f'{DOSSIER_MATCHS}/ is missing or unreadable')
+    return {'seasons': len(saisons_disponibles())}
+
+def check_upload_folder():
+    if not os.access(app.config['UPLOAD_FOLDER'], os.W_OK | os.X_OK):
+        raise OSError('upload folder is missing or not writable')
+
+health_monitor = HealthMonitor({
+    'database': check_database,
+    'matches_folder': check_matches_folder,
+    'upload_folder': check_upload_folder,
+}, interval=app.config['HEALTH_REFRESH_SECONDS'])
+
+HEALTH_ENDPOINTS = {'healthz', 'readyz'}
+
+@app.before_request
+def track_request_start():
+    health_monitor.start()
+    if request.endpoint not in HEALTH_ENDPOINTS:
+        health_monitor.request_started()
+        g.health_counted = True
+
+@app.teardown_request
+def track_request_end(exc):
+    if g.pop('health_counted', False):
+        health_monitor.request_finished()
+
+def pool_status():
+    pool = db.engine.pool
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    if 'pool_size' not in options or not hasattr(pool, 'checkedout'):
+        return None
+    capacity = options['pool_size'] + max(options['max_overflow'], 0)
+    checked_out = pool.checkedout()
+    return {
+        'size': options['pool_size'],
+        'max_overflow': options['max_overflow'],
+        'checked_out': checked_out,
+        'saturation': round(checked_out / capacity, 3),
+    }
+
+def health_report():
+    snapshot, age = health_monitor.snapshot()
+    capacity = app.config['WORKER_CAPACITY']
+    # Open /api/live streams hold a thread or greenlet after their request
+    # context has ended, so they are counted on top of in-flight requests.
+    busy = health_monitor.in_flight + broadcaster.subscriber_count
+    workers = {
+        'pid': os.getpid(),
+        'class': app.config['WORKER_CLASS'],
+        'capacity': capacity,
+        'in_flight': health_monitor.in_flight,
+        'live_streams': broadcaster.subscriber_count,
+        'peak_in_flight': snapshot['peak_in_flight'] if snapshot else None,
+        'saturation': round(busy / capacity, 3),
+    }
+    db_pool = pool_status()
+
+    if snapshot is None:
+        status = 'starting'
+    elif health_monitor.is_stale(age):
+        status = 'stale'
+    elif not all(check['ok'] for check in snapshot['checks'].values()):
+        status = 'failing'
+    else:
+        status = 'ok'
+    saturation = max(workers['saturation'], db_pool['saturation'] if db_pool else 0)
+    saturated = saturation >= app.config['READY_MAX_SATURATION']
+
+    return {
+        'status': status,
+        'saturated': saturated,
+        'checked_at': datetime.utcfromtimestamp(snapshot['checked_at']).isoformat() + 'Z' if snapshot else None,
+        'age_seconds': round(age, 1) if age is not None else None,
+        'checks': snapshot['checks'] if snapshot else {},
+        'workers': workers,
+        'db_pool': db_pool,
+    }
+
+def health_response(report, healthy):
+    response = jsonify(report)
+    response.status_code = 200 if healthy else 503
+    response.headers['Cache-Control'] = 'no-store'
+    if not healthy:
+        response.headers['Retry-After'] = str(int(app.config['HEALTH_REFRESH_SECONDS']) or 1)
+    return response
+
+@app.route('/healthz')
+def healthz():
+    # Liveness: checks pass and the snapshot is fresh. Saturation alone does
+    # not fail it, so a busy instance is never restarted for being busy.
+    report = health_report()
+    return health_response(report, report['status'] == 'ok')
+
+@app.route('/readyz')
+def readyz():
+    # Readiness: healthy and with room for more traffic.
+    report = health_report()
+    return health_response(report, report['status'] == 'ok' and not report['saturated'])
+
 def create_admin_user():
     try:
         if not User.query.filter_by(username='admin').first():
             admin = User(
                 username='admin',
                 email='admin@lesplombiers.com',
-                password_hash=generate_password_hash('admin123')
+                password_hash=hash_password('admin123')
             )
             db.session.add(admin)
             db.session.commit()
@@ -359,16 +1404,55 @@ def create_admin_user():
     except Exception as e:
         print(f"Could not create admin user: {e}")
 
+# create_all() never alters existing tables, so columns added after a
+# database was first created are added here.
+SCHEMA_ADDITIONS = [
+    ('matches', 'season', 'VARCHAR(9)', 'CREATE INDEX IF NOT EXISTS ix_matches_season_date ON matches (season, date)'),
+]
+
+def ensure_schema():
+    inspector = db.inspect(db.engine)
+    added = []
+    for table, column, column_type, index_ddl in SCHEMA_ADDITIONS:
+        if column not in {c['name'] for c in inspector.get_columns(table)}:
+            with db.engine.begin() as connection:
+                connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}'))
+                if index_ddl:
+                    connection.execute(text(index_ddl))
+            added.append(f'{table}.{column}')
+    if 'matches.season' in added:
+        for match in Match.query.filter(Match.season.is_(None)):
+            match.season = saison_pour_date(match.date)
+        db.session.commit()
+    # Expression indexes cannot be reflected on SQLite, so rely on IF NOT EXISTS.
+    with db.engine.begin() as connection:
+        for table in (Player.__table__, Match.__table__):
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+    return added
+
 def init_database():
     try:
-        db.create_all()
+        # Tables live on the primary only; the replica bind is read-only.
+        db.create_all(bind_key=None)
+        ensure_schema()
+        with db.engine.begin() as connection:
+            search_index.creer_index(connection)
+            index_is_empty = search_index.compter(connection) == 0
+        if index_is_empty and (Player.query.first() or News.query.first()):
+            rebuild_search_index()
+        if TeamRecord.query.first() is None and Match.query.first():
+            with db.engine.begin() as connection:
+                for (season,) in db.session.query(Match.season).distinct():
+                    refresh_team_records(connection, season)
         create_admin_user()
         print("Database initialized successfully!")
     except Exception as e:
         print(f"Database initialization error: {e}")
 
-with app.app_context():
-    init_database()
+if app.config['INIT_DATABASE']:
+    with app.app_context():
+        init_database()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
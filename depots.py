@@ -0,0 +1,216 @@
+"""
+Accès unifié aux statistiques des joueurs
+Les Plombiers Hockey
+
+Trois sources gardent les mêmes statistiques :
+  - DepotJson  : fichiers de match par saison (agent_stats_hockey.py, saisons.py)
+  - DepotSql   : table players de l'application Flask (SQLAlchemy)
+  - DepotMysql : schéma joueurs / matchs / statistiques des scripts d'export
+
+Chacune expose matchs(), version() et totaux(); le classement et les totaux
+passent tous par agregation.py, et DepotEnCache ajoute le même cache devant
+n'importe laquelle, invalidé par la version de la source.
+
+Capacités de chaque source :
+                  matchs()   totaux(saison)   totaux() / classement() carrière
+  DepotJson         oui          oui                 oui
+  DepotSql          non          non                 oui
+  DepotMysql        oui          oui                 oui
+Une demande hors de ces capacités lève DonneesIndisponibles.
+"""
+
+import hashlib
+import threading
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+import saisons
+from agregation import classer, totaliser
+
+
+class DonneesIndisponibles(LookupError):
+    """La source ne garde pas le détail demandé (voir les capacités ci-dessus)"""
+
+
+class Depot:
+    """Interface commune. `saison=None` désigne toutes les saisons.
+
+    `par_match` et `par_saison` disent si la source sait répondre à matchs()
+    et à totaux(saison); sinon ces appels lèvent DonneesIndisponibles.
+    """
+
+    par_match = True
+    par_saison = True
+
+    def saisons(self):
+        return []
+
+    def matchs(self, saison=None):
+        """[(date, {nom: {buts, passes}})] triés par date"""
+        raise NotImplementedError
+
+    def version(self, saison=None):
+        """Change dès que les données de la saison changent"""
+        raise NotImplementedError
+
+    def totaux(self, saison=None):
+        return totaliser(self.matchs(saison))
+
+    def classement(self, saison=None):
+        return classer(self.totaux(saison))
+
+
+class DepotJson(Depot):
+    """Dossier matchs/<saison>/ : manifeste et totaux précalculés"""
+
+    def __init__(self, dossier=saisons.DOSSIER_MATCHS):
+        self.dossier = dossier
+
+    def saisons(self):
+        return saisons.saisons_disponibles(self.dossier)
+
+    def matchs(self, saison=None):
+        liste = []
+        for s in [saison] if saison else sorted(self.saisons()):
+            for entree in saisons.manifeste(s, self.dossier):
+                liste.append((entree['date'], saisons.lire_match(entree['date'], self.dossier)))
+        return liste
+
+    def version(self, saison=None):
+        entrees = []
+        for s in [saison] if saison else sorted(self.saisons()):
+            entrees.extend(saisons.manifeste(s, self.dossier))
+        return saisons.version_manifeste(entrees)
+
+    def totaux(self, saison=None):
+        if saison is None:
+            return saisons.totaux_carriere(self.dossier)
+        return saisons.totaux_saison(saison, self.dossier)
+
+
+class DepotSql(Depot):
+    """Table players de l'application : compteurs de carrière, sans détail par match"""
+
+    par_match = False
+    par_saison = False
+
+    def __init__(self, moteur):
+        # L'application passe db.engine (son pool et ses pragmas); une URL
+        # crée un moteur à part, pour les scripts.
+        self.moteur = moteur if isinstance(moteur, Engine) else create_engine(moteur)
+
+    def matchs(self, saison=None):
+        raise DonneesIndisponibles("Le modèle Player ne garde que des totaux de carrière")
+
+    def version(self, saison=None):
+        with self.moteur.connect() as connexion:
+            ligne = connexion.execute(text("SELECT COUNT(*), MAX(updated_at) FROM players")).one()
+        return f"{ligne[0]}:{ligne[1]}"
+
+    def totaux(self, saison=None):
+        if saison is not None:
+            raise DonneesIndisponibles(f"Le modèle Player ne garde que des totaux de carrière (saison {saison})")
+        with self.moteur.connect() as connexion:
+            lignes = connexion.execute(text(
+                "SELECT name, goals, assists, games_played FROM players WHERE is_active = :actif"
+            ), {'actif': True}).all()
+        return {
+            nom: {'buts': buts or 0, 'passes': passes or 0, 'points': (buts or 0) + (passes or 0),
+                  'matchs': matchs or 0}
+            for nom, buts, passes, matchs in lignes
+        }
+
+
+class DepotMysql(Depot):
+    """Schéma joueurs / matchs / statistiques (scripts/setup_db.py).
+
+    Accepte toute connexion DB-API sur ce schéma : mysql.connector en
+    production, sqlite3 avec les mêmes tables comme substitut local.
+    """
+
+    REQUETE = (
+        "SELECT m.date_match, j.prenom, j.nom, s.buts, s.passes "
+        "FROM statistiques s "
+        "JOIN joueurs j ON s.joueur_id = j.id "
+        "JOIN matchs m ON s.match_id = m.id "
+        "ORDER BY m.date_match, m.id"
+    )
+
+    def __init__(self, connexion):
+        self.connexion = connexion
+
+    def _executer(self, requete):
+        curseur = self.connexion.cursor()
+        try:
+            curseur.execute(requete)
+            return curseur.fetchall()
+        finally:
+            curseur.close()
+
+    def saisons(self):
+        dates = self._executer("SELECT DISTINCT date_match FROM matchs")
+        return sorted({saisons.saison_pour_date(str(d)[:10]) for (d,) in dates}, reverse=True)
+
+    def matchs(self, saison=None):
+        par_date = {}
+        for date_match, prenom, nom, buts, passes in self._executer(self.REQUETE):
+            jour = str(date_match)[:10]
+            if saison and saisons.saison_pour_date(jour) != saison:
+                continue
+            ligne = par_date.setdefault(jour, {}).setdefault(f"{prenom} {nom}".strip(), {'buts': 0, 'passes': 0})
+            ligne['buts'] += buts or 0
+            ligne['passes'] += passes or 0
+        return sorted(par_date.items())
+
+    def version(self, saison=None):
+        # statistiques, la grosse table, est résumée par un agrégat pondéré :
+        # un but ou une passe qui change de joueur ou de match, ou un
+        # joueur_id corrigé, déplace au moins une des sommes. matchs (une
+        # ligne par soir) et joueurs (l'effectif) sont petites : on les relit
+        # en entier, pour qu'une date déplacée d'une saison à l'autre ou un nom
+        # corrigé change aussi la version.
+        agregat = self._executer(
+            "SELECT COUNT(*), SUM(buts), SUM(passes), SUM(joueur_id * buts), SUM(joueur_id * passes), "
+            "SUM(match_id * buts), SUM(match_id * passes), SUM(joueur_id * match_id) FROM statistiques"
+        )
+        matchs = self._executer("SELECT id, date_match FROM matchs ORDER BY id")
+        joueurs = self._executer("SELECT id, prenom, nom FROM joueurs ORDER BY id")
+        return hashlib.sha256(repr((agregat, matchs, joueurs)).encode()).hexdigest()[:16]
+
+
+class DepotEnCache(Depot):
+    """Garde totaux et classements tant que la version de la source ne change pas"""
+
+    def __init__(self, depot):
+        self.depot = depot
+        self.par_match = depot.par_match
+        self.par_saison = depot.par_saison
+        self._cache = {}
+        self._verrou = threading.Lock()
+
+    def saisons(self):
+        return self.depot.saisons()
+
+    def matchs(self, saison=None):
+        return self.depot.matchs(saison)
+
+    def version(self, saison=None):
+        return self.depot.version(saison)
+
+    def _memoriser(self, cle, saison, calcul):
+        version = self.depot.version(saison)
+        with self._verrou:
+            trouve = self._cache.get((cle, saison))
+        if trouve is not None and trouve[0] == version:
+            return trouve[1]
+        valeur = calcul(saison)
+        with self._verrou:
+            self._cache[(cle, saison)] = (version, valeur)
+        return valeur
+
+    def totaux(self, saison=None):
+        return self._memoriser('totaux', saison, self.depot.totaux)
+
+    def classement(self, saison=None):
+        return self._memoriser('classement', saison, lambda s: classer(self.totaux(s)))
@@ -0,0 +1,111 @@
+"""
+Lecture/écriture des fichiers JSON (matchs, podiums) sans bloquer les workers
+Les Plombiers Hockey
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+ENCODING = 'utf-8'
+
+# Lu une fois à l'import (os.umask ne se lit qu'en le modifiant, ce qui
+# n'est pas sûr une fois les threads lancés).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _hub_gevent():
+    """Retourne le hub gevent si le processus a été patché, sinon None"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return None
+    if not monkey.is_module_patched('socket'):
+        return None
+    import gevent
+    return gevent.get_hub()
+
+
+def executer_bloquant(fonction, *args, **kwargs):
+    """Exécute une opération disque hors de la boucle d'événements.
+
+    Sous gevent, les accès disque ne sont pas coopératifs : on les délègue au
+    pool de threads du hub pour que les autres connexions continuent d'être
+    servies. Avec les workers sync ou gthread, l'appel est direct.
+    """
+    hub = _hub_gevent()
+    if hub is None:
+        return fonction(*args, **kwargs)
+    return hub.threadpool.apply(fonction, args, kwargs)
+
+
+def _ecrire_atomique(chemin, contenu):
+    dossier = os.path.dirname(chemin) or '.'
+    os.makedirs(dossier, exist_ok=True)
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(descripteur, 'w', encoding=ENCODING) as f:
+            f.write(contenu)
+        # mkstemp crée le fichier en 0600 : on reprend les droits du fichier
+        # remplacé, ou ceux d'un fichier neuf (0666 moins l'umask).
+        try:
+            mode = os.stat(chemin).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temporaire, mode)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+
+def _lire(chemin):
+    try:
+        with open(chemin, 'r', encoding=ENCODING) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def serialiser(donnees):
+    return json.dumps(donnees, indent=2, ensure_ascii=False)
+
+
+def empreinte(contenu):
+    """SHA-256 du contenu tel qu'écrit sur disque"""
+    return hashlib.sha256(contenu.encode(ENCODING)).hexdigest()
+
+
+def empreinte_fichier(chemin):
+    """SHA-256 d'un fichier existant, ou None s'il n'existe pas"""
+    contenu = executer_bloquant(_lire, chemin)
+    return None if contenu is None else empreinte(contenu)
+
+
+def ecrire_json(chemin, donnees):
+    """Sauvegarde un fichier JSON de façon atomique (jamais de fichier à moitié écrit)"""
+    executer_bloquant(_ecrire_atomique, chemin, serialiser(donnees))
+
+
+def ecrire_json_si_change(chemin, donnees):
+    """Comme ecrire_json, sans toucher au fichier si son contenu est identique.
+
+    Retourne (écrit, empreinte du contenu).
+    """
+    contenu = serialiser(donnees)
+    existant = executer_bloquant(_lire, chemin)
+    if existant == contenu:
+        return False, empreinte(contenu)
+    executer_bloquant(_ecrire_atomique, chemin, contenu)
+    return True, empreinte(contenu)
+
+
+def lire_json(chemin):
+    """Charge un fichier JSON, ou None s'il n'existe pas"""
+    contenu = executer_bloquant(_lire, chemin)
+    if contenu is None:
+        return None
+    return json.loads(contenu)
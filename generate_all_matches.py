@@ -2,42 +2,37 @@
 """
 Script pour générer automatiquement tous les fichiers JSON de matches
 Les Plombiers Hockey - Saison 2024-2025
+
+Chaque match est écrit dans la partition de sa saison
+(matchs/<saison>/match_AAAA_MM_JJ.json, voir saisons.py). Le script est
+idempotent : un fichier dont le contenu n'a pas changé n'est pas réécrit.
+Les écritures passent par un pool de threads avec renommage atomique, puis
+le manifeste et les totaux de chaque saison touchée sont recalculés une
+seule fois.
+
+Une saison synthétique (--synthetique) va dans matchs_synthetiques/ et non
+dans le dossier lu par le site; pour la charger quand même, il faut le
+demander avec --dossier.
+
+Usage: python generate_all_matches.py
+       python generate_all_matches.py --synthetique 300 --joueurs 40 --saison 2030-2031
 """
 
+import argparse
 import os
-import json
-from datetime import datetime
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 
-def create_matchs_directory():
-    """Crée le dossier matchs s'il n'existe pas"""
-    if not os.path.exists('matchs'):
-        os.makedirs('matchs')
-        print("✅ Dossier 'matchs' créé")
-    else:
-        print("📁 Dossier 'matchs' existe déjà")
+import saisons
+from fichiers import ecrire_json_si_change
 
-def save_match_json(filename, data):
-    """Sauvegarde un match au format JSON"""
-    filepath = os.path.join('matchs', filename)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    total_goals = sum(player_stats.get('buts', 0) for player_stats in data.values())
-    total_assists = sum(player_stats.get('passes', 0) for player_stats in data.values())
-    print(f"✅ {filename}: {len(data)} joueurs, {total_goals}B {total_assists}P")
+# Les saisons fictives ne doivent jamais apparaître sur le site par accident
+DOSSIER_SYNTHETIQUE = 'matchs_synthetiques'
 
-def generate_all_matches():
-    """Génère tous les fichiers JSON de matches"""
-    print("🏒 GÉNÉRATION DE TOUS LES MATCHES - LES PLOMBIERS HOCKEY")
-    print("=" * 60)
-    
-    create_matchs_directory()
-    
-    # Matches réels d'avril 2025
-    print("\n📊 Génération des matches réels d'avril 2025...")
-    
+MATCHS_REELS = {
     # 8 avril 2025 - La soirée de Jean-Dominique
-    match_2025_04_08 = {
+    "2025-04-08": {
         "Jean-Dominique Hamel": {"buts": 4, "passes": 0},
         "Hugo Ferland": {"buts": 2, "passes": 0},
         "Alex Boutin": {"buts": 0, "passes": 3},
@@ -45,11 +40,10 @@ def generate_all_matches():
         "Simon Kearney": {"buts": 0, "passes": 1},
         "Gregory Belanger": {"buts": 0, "passes": 1},
         "Nicolas Lahaye": {"buts": 0, "passes": 1}
-    }
-    save_match_json("match_2025-04-08.json", match_2025_04_08)
-    
+    },
+
     # 22 avril 2025 - David Rémillard en feu
-    match_2025_04_22 = {
+    "2025-04-22": {
         "David Rémillard": {"buts": 3, "passes": 2},
         "Hugo Ferland": {"buts": 2, "passes": 1},
         "Jérome Casabon Perso": {"buts": 2, "passes": 1},
@@ -59,11 +53,10 @@ def generate_all_matches():
         "Mathieu Rivard": {"buts": 1, "passes": 3},
         "David Girard": {"buts": 0, "passes": 1},
         "Alex Boutin": {"buts": 0, "passes": 0}
-    }
-    save_match_json("match_2025-04-22.json", match_2025_04_22)
-    
+    },
+
     # 29 avril 2025 - Hugo termine en beauté
-    match_2025_04_29 = {
+    "2025-04-29": {
         "Hugo Ferland": {"buts": 4, "passes": 0},
         "Jérome Casabon Perso": {"buts": 3, "passes": 0},
         "Nicolas Lahaye": {"buts": 1, "passes": 1},
@@ -75,374 +68,433 @@ def generate_all_matches():
         "David Rémillard": {"buts": 0, "passes": 1},
         "Nicolas Savard": {"buts": 0, "passes": 1}
     }
-    save_match_json("match_2025-04-29.json", match_2025_04_29)
-    
-    # Matches de démonstration
-    print("\n🎲 Génération des matches de démonstration...")
-    
-    demo_matches = {
-        # Septembre 2024 - Début de saison
-        "match_2024-09-10.json": {
-            "Simon Djcooleur Tremblay": {"buts": 2, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 2},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 1, "passes": 0},
-            "Jean-François Breton": {"buts": 0, "passes": 2},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0}
-        },
-        
-        "match_2024-09-17.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 1, "passes": 1}
-        },
-        
-        "match_2024-09-24.json": {
-            "David Rémillard": {"buts": 3, "passes": 0},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Gregory Belanger": {"buts": 0, "passes": 1}
-        },
-        
-        # Octobre 2024
-        "match_2024-10-01.json": {
-            "Hugo Ferland": {"buts": 3, "passes": 0},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2024-10-08.json": {
-            "Simon Djcooleur Tremblay": {"buts": 2, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Nicolas Lahaye": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2024-10-15.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 2},
-            "David Rémillard": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Mathieu Rivard": {"buts": 1, "passes": 1}
-        },
-        
-        "match_2024-10-22.json": {
-            "Jean-François Breton": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 0, "passes": 2}
-        },
-        
-        "match_2024-10-29.json": {
-            "David Rémillard": {"buts": 2, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "David Girard": {"buts": 1, "passes": 0}
-        },
-        
-        # Novembre 2024
-        "match_2024-11-05.json": {
-            "David Rémillard": {"buts": 2, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Mathieu Rivard": {"buts": 0, "passes": 2}
-        },
-        
-        "match_2024-11-12.json": {
-            "Simon Djcooleur Tremblay": {"buts": 3, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 2},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Gregory Belanger": {"buts": 1, "passes": 1}
-        },
-        
-        "match_2024-11-19.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Nicolas Lahaye": {"buts": 1, "passes": 1}
-        },
-        
-        "match_2024-11-26.json": {
-            "David Rémillard": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Mathieu Rivard": {"buts": 0, "passes": 2}
-        },
-        
-        # Décembre 2024
-        "match_2024-12-03.json": {
-            "Jean-Dominique Hamel": {"buts": 2, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Gregory Belanger": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2024-12-10.json": {
-            "Hugo Ferland": {"buts": 3, "passes": 0},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 0, "passes": 1}
-        },
-        
-        "match_2024-12-17.json": {
-            "Jean-Dominique Hamel": {"buts": 2, "passes": 2},
-            "Hugo Ferland": {"buts": 2, "passes": 0},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "David Girard": {"buts": 1, "passes": 0}
-        },
-        
-        # Janvier 2025 - Reprise
-        "match_2025-01-07.json": {
-            "Simon Djcooleur Tremblay": {"buts": 2, "passes": 2},
-            "Hugo Ferland": {"buts": 2, "passes": 0},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 0, "passes": 1}
-        },
-        
-        "match_2025-01-14.json": {
-            "David Rémillard": {"buts": 2, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Nicolas Lahaye": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2025-01-21.json": {
-            "Simon Djcooleur Tremblay": {"buts": 2, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Gregory Belanger": {"buts": 0, "passes": 1}
-        },
-        
-        "match_2025-01-28.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 1},
-            "Jean-François Breton": {"buts": 2, "passes": 0},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 0, "passes": 2},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Mathieu Rivard": {"buts": 1, "passes": 1}
-        },
-        
-        # Février 2025
-        "match_2025-02-04.json": {
-            "Hugo Ferland": {"buts": 3, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Nicolas Lahaye": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2025-02-11.json": {
-            "David Rémillard": {"buts": 3, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2025-02-18.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "David Girard": {"buts": 0, "passes": 1}
-        },
-        
-        "match_2025-02-25.json": {
-            "Jean-Dominique Hamel": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Nicolas Lahaye": {"buts": 1, "passes": 0}
-        },
-        
-        # Mars 2025
-        "match_2025-03-04.json": {
-            "David Rémillard": {"buts": 2, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 2},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Jérome Casabon Perso": {"buts": 1, "passes": 1}
-        },
-        
-        "match_2025-03-11.json": {
-            "Simon Djcooleur Tremblay": {"buts": 2, "passes": 1},
-            "Hugo Ferland": {"buts": 1, "passes": 2},
-            "David Rémillard": {"buts": 1, "passes": 1},
-            "Jean-François Breton": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Mathieu Rivard": {"buts": 0, "passes": 2}
-        },
-        
-        "match_2025-03-18.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 1},
-            "David Rémillard": {"buts": 2, "passes": 0},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Alex Boutin": {"buts": 0, "passes": 1}
-        },
-        
-        "match_2025-03-25.json": {
-            "Jean-François Breton": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
-            "Nicolas Savard": {"buts": 0, "passes": 1},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Gregory Belanger": {"buts": 1, "passes": 1}
-        },
-        
-        # Avril 2025 - Début des playoffs
-        "match_2025-04-01.json": {
-            "David Rémillard": {"buts": 2, "passes": 2},
-            "Hugo Ferland": {"buts": 1, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Dave Jolicoeur": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Billy Ouellet": {"buts": 0, "passes": 0},
-            "Nicolas Lahaye": {"buts": 1, "passes": 0}
-        },
-        
-        "match_2025-04-15.json": {
-            "Hugo Ferland": {"buts": 2, "passes": 1},
-            "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
-            "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
-            "David Rémillard": {"buts": 1, "passes": 0},
-            "Nicolas Savard": {"buts": 0, "passes": 2},
-            "Simon Kearney": {"buts": 0, "passes": 1},
-            "Jean-François Breton": {"buts": 0, "passes": 1},
-            "Nicolas Gémus": {"buts": 0, "passes": 0},
-            "Mathieu Rivard": {"buts": 0, "passes": 1}
-        }
+}
+
+
+MATCHS_DEMO = {
+    # Septembre 2024 - Début de saison
+    "2024-09-10": {
+        "Simon Djcooleur Tremblay": {"buts": 2, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 2},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 1, "passes": 0},
+        "Jean-François Breton": {"buts": 0, "passes": 2},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0}
+    },
+
+    "2024-09-17": {
+        "Hugo Ferland": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 1, "passes": 1}
+    },
+
+    "2024-09-24": {
+        "David Rémillard": {"buts": 3, "passes": 0},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Gregory Belanger": {"buts": 0, "passes": 1}
+    },
+
+    # Octobre 2024
+    "2024-10-01": {
+        "Hugo Ferland": {"buts": 3, "passes": 0},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 1, "passes": 0}
+    },
+
+    "2024-10-08": {
+        "Simon Djcooleur Tremblay": {"buts": 2, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Nicolas Lahaye": {"buts": 1, "passes": 0}
+    },
+
+    "2024-10-15": {
+        "Hugo Ferland": {"buts": 2, "passes": 2},
+        "David Rémillard": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Mathieu Rivard": {"buts": 1, "passes": 1}
+    },
+
+    "2024-10-22": {
+        "Jean-François Breton": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 0, "passes": 2}
+    },
+
+    "2024-10-29": {
+        "David Rémillard": {"buts": 2, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "David Girard": {"buts": 1, "passes": 0}
+    },
+
+    # Novembre 2024
+    "2024-11-05": {
+        "David Rémillard": {"buts": 2, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Mathieu Rivard": {"buts": 0, "passes": 2}
+    },
+
+    "2024-11-12": {
+        "Simon Djcooleur Tremblay": {"buts": 3, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 2},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Gregory Belanger": {"buts": 1, "passes": 1}
+    },
+
+    "2024-11-19": {
+        "Hugo Ferland": {"buts": 2, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Nicolas Lahaye": {"buts": 1, "passes": 1}
+    },
+
+    "2024-11-26": {
+        "David Rémillard": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Mathieu Rivard": {"buts": 0, "passes": 2}
+    },
+
+    # Décembre 2024
+    "2024-12-03": {
+        "Jean-Dominique Hamel": {"buts": 2, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Gregory Belanger": {"buts": 1, "passes": 0}
+    },
+
+    "2024-12-10": {
+        "Hugo Ferland": {"buts": 3, "passes": 0},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 0, "passes": 1}
+    },
+
+    "2024-12-17": {
+        "Jean-Dominique Hamel": {"buts": 2, "passes": 2},
+        "Hugo Ferland": {"buts": 2, "passes": 0},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "David Girard": {"buts": 1, "passes": 0}
+    },
+
+    # Janvier 2025 - Reprise
+    "2025-01-07": {
+        "Simon Djcooleur Tremblay": {"buts": 2, "passes": 2},
+        "Hugo Ferland": {"buts": 2, "passes": 0},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 0, "passes": 1}
+    },
+
+    "2025-01-14": {
+        "David Rémillard": {"buts": 2, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Nicolas Lahaye": {"buts": 1, "passes": 0}
+    },
+
+    "2025-01-21": {
+        "Simon Djcooleur Tremblay": {"buts": 2, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Gregory Belanger": {"buts": 0, "passes": 1}
+    },
+
+    "2025-01-28": {
+        "Hugo Ferland": {"buts": 2, "passes": 1},
+        "Jean-François Breton": {"buts": 2, "passes": 0},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 0, "passes": 2},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Mathieu Rivard": {"buts": 1, "passes": 1}
+    },
+
+    # Février 2025
+    "2025-02-04": {
+        "Hugo Ferland": {"buts": 3, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Nicolas Lahaye": {"buts": 1, "passes": 0}
+    },
+
+    "2025-02-11": {
+        "David Rémillard": {"buts": 3, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 1, "passes": 0}
+    },
+
+    "2025-02-18": {
+        "Hugo Ferland": {"buts": 2, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "David Girard": {"buts": 0, "passes": 1}
+    },
+
+    "2025-02-25": {
+        "Jean-Dominique Hamel": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Nicolas Lahaye": {"buts": 1, "passes": 0}
+    },
+
+    # Mars 2025
+    "2025-03-04": {
+        "David Rémillard": {"buts": 2, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 2},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Jérome Casabon Perso": {"buts": 1, "passes": 1}
+    },
+
+    "2025-03-11": {
+        "Simon Djcooleur Tremblay": {"buts": 2, "passes": 1},
+        "Hugo Ferland": {"buts": 1, "passes": 2},
+        "David Rémillard": {"buts": 1, "passes": 1},
+        "Jean-François Breton": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Mathieu Rivard": {"buts": 0, "passes": 2}
+    },
+
+    "2025-03-18": {
+        "Hugo Ferland": {"buts": 2, "passes": 1},
+        "David Rémillard": {"buts": 2, "passes": 0},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Alex Boutin": {"buts": 0, "passes": 1}
+    },
+
+    "2025-03-25": {
+        "Jean-François Breton": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Jean-Dominique Hamel": {"buts": 0, "passes": 2},
+        "Nicolas Savard": {"buts": 0, "passes": 1},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Gregory Belanger": {"buts": 1, "passes": 1}
+    },
+
+    # Avril 2025 - Début des playoffs
+    "2025-04-01": {
+        "David Rémillard": {"buts": 2, "passes": 2},
+        "Hugo Ferland": {"buts": 1, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 1},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Dave Jolicoeur": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Billy Ouellet": {"buts": 0, "passes": 0},
+        "Nicolas Lahaye": {"buts": 1, "passes": 0}
+    },
+
+    "2025-04-15": {
+        "Hugo Ferland": {"buts": 2, "passes": 1},
+        "Simon Djcooleur Tremblay": {"buts": 1, "passes": 2},
+        "Jean-Dominique Hamel": {"buts": 1, "passes": 1},
+        "David Rémillard": {"buts": 1, "passes": 0},
+        "Nicolas Savard": {"buts": 0, "passes": 2},
+        "Simon Kearney": {"buts": 0, "passes": 1},
+        "Jean-François Breton": {"buts": 0, "passes": 1},
+        "Nicolas Gémus": {"buts": 0, "passes": 0},
+        "Mathieu Rivard": {"buts": 0, "passes": 1}
     }
+}
+
+
+def create_matchs_directory(dossier=saisons.DOSSIER_MATCHS):
+    """Crée le dossier matchs s'il n'existe pas"""
+    if not os.path.exists(dossier):
+        os.makedirs(dossier)
+        print(f"✅ Dossier '{dossier}' créé")
+    else:
+        print(f"📁 Dossier '{dossier}' existe déjà")
+
+def save_match_json(date_match, data, dossier=saisons.DOSSIER_MATCHS):
+    """Écrit un match s'il a changé. Retourne (saison, écrit, entrée de manifeste)"""
+    ecrit, empreinte = ecrire_json_si_change(saisons.fichier_match(date_match, dossier), data)
+    return saisons.saison_pour_date(date_match), ecrit, saisons.entree_manifeste(date_match, data, empreinte)
+
+def synthetiser_saison(saison, nb_matchs, nb_joueurs, graine=0):
+    """Matchs fictifs pour les tests de charge, un par jour à partir du 1er août.
+
+    La graine fixe rend le résultat reproductible : relancer la génération
+    ne réécrit rien.
+    """
+    if nb_matchs > 365:
+        raise ValueError("Une saison synthétique compte au plus 365 matchs")
+    hasard = random.Random(f"{saison}:{graine}")
+    joueurs = [f"Joueur Synthétique {i:04d}" for i in range(1, nb_joueurs + 1)]
+    premier = date(int(saison[:4]), 8, 1)
+    matchs = {}
+    for i in range(nb_matchs):
+        presents = hasard.sample(joueurs, min(len(joueurs), hasard.randint(8, 14)))
+        matchs[(premier + timedelta(days=i)).isoformat()] = {
+            nom: {"buts": hasard.choice((0, 0, 0, 1, 1, 2, 3)), "passes": hasard.choice((0, 0, 1, 1, 2))}
+            for nom in presents
+        }
+    return matchs
+
+def generer_matchs(matchs, dossier=saisons.DOSSIER_MATCHS, threads=8):
+    """Écrit {date: stats} en parallèle puis met à jour chaque saison touchée une fois"""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        resultats = list(pool.map(lambda item: save_match_json(*item, dossier=dossier), matchs.items()))
+
+    par_saison = {}
+    for saison, ecrit, entree in resultats:
+        par_saison.setdefault(saison, {})[entree['fichier']] = entree
+    for saison, connues in sorted(par_saison.items()):
+        saisons.recalculer_manifeste(saison, dossier, connues)
+        saisons.recalculer_totaux_saison(saison, dossier)
+    saisons.recalculer_totaux_carriere(dossier)
+
+    ecrits = sum(1 for r in resultats if r[1])
+    return ecrits, len(resultats) - ecrits
+
+def generate_all_matches(dossier=saisons.DOSSIER_MATCHS, threads=8):
+    """Génère tous les fichiers JSON de matches"""
+    print("🏒 GÉNÉRATION DE TOUS LES MATCHES - LES PLOMBIERS HOCKEY")
+    print("=" * 60)
+    
+    create_matchs_directory(dossier)
     
-    # Sauvegarder tous les matches de démonstration
-    for filename, data in demo_matches.items():
-        save_match_json(filename, data)
+    print("\n📊 Matches réels d'avril 2025 + matches de démonstration...")
+    ecrits, inchanges = generer_matchs({**MATCHS_DEMO, **MATCHS_REELS}, dossier, threads)
     
     print(f"\n🎉 GÉNÉRATION TERMINÉE!")
-    print(f"✅ Total: {len(demo_matches) + 3} matches générés")
-    print(f"📊 3 matches réels + {len(demo_matches)} matches de démonstration")
+    print(f"✅ Total: {len(MATCHS_DEMO) + len(MATCHS_REELS)} matches "
+          f"({ecrits} écrits, {inchanges} déjà à jour)")
+    print(f"📊 {len(MATCHS_REELS)} matches réels + {len(MATCHS_DEMO)} matches de démonstration")
+    
+    totaux = saisons.totaux_saison(saisons.saison_pour_date(max(MATCHS_REELS)), dossier)
+    print(f"🥅 {len(totaux)} joueurs, "
+          f"{sum(j['buts'] for j in totaux.values())}B {sum(j['passes'] for j in totaux.values())}P")
     
     return True
 
@@ -470,8 +522,25 @@ def generate_season_summary():
     print(f"✅ Configuration de déploiement corrigée")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dossier', help=f"défaut : {saisons.DOSSIER_MATCHS}, "
+                                          f"ou {DOSSIER_SYNTHETIQUE} avec --synthetique")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--synthetique', type=int, metavar='MATCHS',
+                        help="génère une saison fictive de MATCHS matchs (tests de charge)")
+    parser.add_argument('--joueurs', type=int, default=40)
+    parser.add_argument('--saison', default='2099-2100')
+    args = parser.parse_args()
+    if args.dossier is None:
+        args.dossier = DOSSIER_SYNTHETIQUE if args.synthetique else saisons.DOSSIER_MATCHS
     try:
-        success = generate_all_matches()
+        if args.synthetique:
+            create_matchs_directory(args.dossier)
+            matchs = synthetiser_saison(args.saison, args.synthetique, args.joueurs)
+            ecrits, inchanges = generer_matchs(matchs, args.dossier, args.threads)
+            print(f"🎲 Saison {args.saison}: {len(matchs)} matches ({ecrits} écrits, {inchanges} déjà à jour)")
+            raise SystemExit(0)
+        success = generate_all_matches(args.dossier, args.threads)
         if success:
             generate_season_summary()
             print(f"\n🚀 Prochaines étapes:")
@@ -0,0 +1,34 @@
+# Gunicorn configuration for Les Plombiers
+#
+# WEB_WORKER_CLASS picks the concurrency model:
+#   gevent (default) - cooperative greenlets, needed for the /api/live stream
+#                      every visitor keeps open; WORKER_CONNECTIONS caps them
+#   gthread          - each worker serves WEB_THREADS requests at once
+#   sync             - the old one-request-per-worker behaviour
+# Under gthread and sync /api/live answers 503 (see LIVE_EVENTS_ENABLED in
+# app.py) rather than pinning one thread per visitor.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+worker_class = os.environ.get('WEB_WORKER_CLASS', 'gevent')
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+# gunicorn silently turns sync into gthread when threads > 1.
+threads = int(os.environ.get('WEB_THREADS', 8)) if worker_class == 'gthread' else 1
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
+
+# Server-Sent Events keep responses open; the heartbeat in live_events is
+# shorter than this so gevent/gthread workers are never killed mid-stream.
+# Live events from every worker (and from agent_stats_hockey.py) go through
+# the SQLite journal at LIVE_EVENTS_DB; on several hosts it must sit on
+# storage they all share.
+timeout = int(os.environ.get('WEB_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
@@ -0,0 +1,89 @@
+"""
+État de santé du site pour les sondes /healthz et /readyz
+Les Plombiers Hockey
+"""
+
+import os
+import threading
+import time
+
+
+class HealthMonitor:
+    """Garde un instantané de l'état du worker, rafraîchi en arrière-plan.
+
+    Les vérifications (ping de la base, dossiers) tournent dans un fil toutes
+    les `interval` secondes; une sonde ne fait que lire le dernier instantané
+    et quelques compteurs en mémoire, sans requête SQL ni accès disque.
+
+    Le fil démarre à la première requête de chaque processus : un fil lancé
+    avant le fork de gunicorn ne survivrait pas dans les workers.
+    """
+
+    def __init__(self, checks, interval=5.0):
+        self._checks = checks
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak = 0
+        self._snapshot = None
+        self._pid = None
+
+    def request_started(self):
+        with self._lock:
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+
+    def request_finished(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def refresh(self):
+        """Lance chaque vérification; une exception la marque en échec"""
+        results = {}
+        for name, check in self._checks.items():
+            started = time.perf_counter()
+            try:
+                results[name] = {'ok': True, **(check() or {})}
+            except Exception as e:
+                results[name] = {'ok': False, 'error': str(e) or type(e).__name__}
+            results[name]['ms'] = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            # Pic depuis le rafraîchissement précédent, puis on repart du niveau actuel.
+            peak, self._peak = self._peak, self._in_flight
+        self._snapshot = {'checked_at': time.time(), 'checks': results, 'peak_in_flight': peak}
+        return self._snapshot
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            time.sleep(self.interval)
+
+    def start(self):
+        """Démarre le fil de rafraîchissement une fois par processus"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._snapshot = None
+        threading.Thread(target=self._run, name='health-monitor', daemon=True).start()
+
+    def snapshot(self):
+        """Dernier instantané (None avant la première vérification) et son âge en secondes"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None, None
+        return snapshot, time.time() - snapshot['checked_at']
+
+    def is_stale(self, age):
+        # Un instantané qui ne se renouvelle plus veut dire qu'une vérification
+        # reste bloquée (base qui ne répond pas) ou que le fil est mort.
+        return age is None or age > max(3 * self.interval, 15)
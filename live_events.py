@@ -0,0 +1,207 @@
+"""
+Diffusion en direct des scores et statistiques (Server-Sent Events)
+Les Plombiers Hockey
+
+Les événements passent par un petit journal SQLite (LIVE_EVENTS_DB, par
+défaut instance/live_events.db) : chaque worker gunicorn, comme l'agent de
+statistiques qui tourne dans un autre processus, y écrit ce qu'il publie, et
+chaque processus relit les nouvelles lignes pour les diffuser à ses propres
+abonnés. Les id du journal sont communs à tous : un navigateur qui se
+reconnecte sur un autre worker reprend au bon endroit avec Last-Event-ID.
+
+LIVE_EVENTS_DB vide : diffusion limitée au processus (un seul worker).
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 64
+HISTORY_SIZE = 50
+POLL_SECONDS = 0.5
+JOURNAL_SIZE = 1000
+
+
+def format_event(event_id, event, data):
+    """Formate une trame SSE"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class EventJournal:
+    """Journal d'événements partagé entre processus, dans un fichier SQLite"""
+
+    def __init__(self, path, keep=JOURNAL_SIZE):
+        self.path = path
+        self.keep = keep
+        self._ready = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, event TEXT NOT NULL, '
+                'data TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            connection.commit()
+            self._ready = True
+        return connection
+
+    def append(self, event, data):
+        """Ajoute un événement et retourne son id"""
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with closing(self._connect()) as connection, connection:
+            event_id = connection.execute(
+                'INSERT INTO events (event, data, created_at) VALUES (?, ?, ?)',
+                (event, payload, time.time())
+            ).lastrowid
+            if event_id % 100 == 0:
+                connection.execute('DELETE FROM events WHERE id <= ?', (event_id - self.keep,))
+        return event_id
+
+    def since(self, event_id, limit=None):
+        """[(id, trame)] des événements postérieurs à event_id, dans l'ordre"""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                'SELECT id, event, data FROM (SELECT * FROM events WHERE id > ? ORDER BY id DESC LIMIT ?) '
+                'ORDER BY id', (event_id, limit if limit is not None else -1)
+            ).fetchall()
+        return [(row_id, f"id: {row_id}\nevent: {event}\ndata: {data}\n\n") for row_id, event, data in rows]
+
+    def last_id(self):
+        with closing(self._connect()) as connection:
+            return connection.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+
+
+class LiveBroadcaster:
+    """Diffuse chaque événement à tous les abonnés connectés.
+
+    Chaque connexion ne coûte qu'une petite file d'attente : la trame est
+    formatée une seule fois par événement, puis partagée entre tous les
+    abonnés. Sous un worker gevent, les files et verrous standards deviennent
+    coopératifs, donc des milliers de connexions inactives restent bon marché.
+
+    Avec un journal, publish() ne fait qu'y écrire; un fil par processus
+    relit le journal toutes les POLL_SECONDS et remet les trames aux abonnés.
+    """
+
+    def __init__(self, journal=None, queue_size=SUBSCRIBER_QUEUE_SIZE, history_size=HISTORY_SIZE,
+                 poll_seconds=POLL_SECONDS):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._history_size = history_size
+        self._queue_size = queue_size
+        self._next_id = 1
+        self._journal = journal
+        self._poll_seconds = poll_seconds
+        self._relay_pid = None
+        self._relayed_id = 0
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def subscribe(self, last_event_id=None):
+        """Enregistre un abonné et rejoue les événements manqués"""
+        subscriber = queue.Queue(maxsize=self._queue_size)
+        if self._journal is not None:
+            self._start_relay()
+            with self._lock:
+                # Le fil relais livre tout ce qui dépasse _relayed_id : on ne
+                # rejoue que jusque-là, sinon la trame arriverait deux fois.
+                if last_event_id is not None and last_event_id < self._relayed_id:
+                    for event_id, frame in self._journal.since(last_event_id, self._history_size):
+                        if event_id <= self._relayed_id:
+                            subscriber.put_nowait(frame)
+                self._subscribers.add(subscriber)
+            return subscriber
+        with self._lock:
+            if last_event_id is not None:
+                for event_id, frame in self._history:
+                    if event_id > last_event_id:
+                        subscriber.put_nowait(frame)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event, data):
+        """Publie un événement vers tous les abonnés (de tous les processus avec un journal)"""
+        if self._journal is not None:
+            return self._journal.append(event, data)
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            frame = format_event(event_id, event, data)
+            self._history.append((event_id, frame))
+        self._deliver(frame)
+        return event_id
+
+    def _deliver(self, frame, event_id=None):
+        with self._lock:
+            if event_id is not None:
+                self._relayed_id = event_id
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(frame)
+            except queue.Full:
+                # Client trop lent : on le déconnecte, il rejouera l'historique
+                # grâce à Last-Event-ID en se reconnectant.
+                self.unsubscribe(subscriber)
+
+    def _start_relay(self):
+        # Un fil lancé avant le fork de gunicorn ne survivrait pas : il démarre
+        # au premier abonné de chaque processus.
+        if self._relay_pid == os.getpid():
+            return
+        with self._lock:
+            if self._relay_pid == os.getpid():
+                return
+            self._relay_pid = os.getpid()
+            self._relayed_id = self._journal.last_id()
+        threading.Thread(target=self._relay, args=(self._relayed_id,), name='live-events-relay',
+                         daemon=True).start()
+
+    def _relay(self, last_id):
+        while True:
+            time.sleep(self._poll_seconds)
+            try:
+                for event_id, frame in self._journal.since(last_id):
+                    last_id = event_id
+                    self._deliver(frame, event_id)
+            except sqlite3.Error:
+                continue
+
+    def stream(self, last_event_id=None, heartbeat=HEARTBEAT_SECONDS):
+        """Générateur de trames SSE pour une connexion"""
+        subscriber = self.subscribe(last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    if subscriber not in self._subscribers:
+                        return
+                    yield ": ping\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+_journal_path = os.environ.get(
+    'LIVE_EVENTS_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'live_events.db')
+)
+broadcaster = LiveBroadcaster(EventJournal(_journal_path) if _journal_path else None)
@@ -0,0 +1,181 @@
+"""
+Résolution des noms de joueurs saisis lors de l'entrée des statistiques
+Les Plombiers Hockey
+
+« Jerome Casabon » et « Jérome Casabon Perso » doivent finir sur la même
+ligne. Les noms canoniques (totaux de carrière) sont indexés une seule fois :
+  - clé normalisée (sans accents, mots triés) -> correspondance exacte en O(1)
+  - index inversé des mots -> nom partiel (« Casabon ») en O(mots)
+  - arbre BK sur les clés -> fautes de frappe en ~O(log n)
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from saisons import totaux_carriere
+from search_index import replier
+
+Resolution = namedtuple('Resolution', ['saisi', 'canonique', 'methode', 'candidats'])
+ResultatIngestion = namedtuple('ResultatIngestion', ['stats', 'corriges', 'ambigus', 'nouveaux'])
+
+_MOT = re.compile(r'[a-z0-9]+')
+
+
+def mots(nom):
+    return _MOT.findall(replier(nom))
+
+
+def cle(nom):
+    """Clé normalisée : 'Jean-François Breton' -> 'breton francois jean'"""
+    return ' '.join(sorted(mots(nom)))
+
+
+def levenshtein(a, b, limite):
+    """Distance d'édition, ou limite + 1 dès qu'elle est dépassée"""
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    precedente = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        courante = [i]
+        for j, cb in enumerate(b, 1):
+            courante.append(min(precedente[j] + 1, courante[j - 1] + 1, precedente[j - 1] + (ca != cb)))
+        if min(courante) > limite:
+            return limite + 1
+        precedente = courante
+    return precedente[-1]
+
+
+class BKTree:
+    """Arbre BK : recherche des clés à distance d'édition <= tolérance"""
+
+    def __init__(self):
+        self.racine = None
+
+    def ajouter(self, cle_noeud):
+        if self.racine is None:
+            self.racine = (cle_noeud, {})
+            return
+        noeud = self.racine
+        while True:
+            distance = levenshtein(cle_noeud, noeud[0], max(len(cle_noeud), len(noeud[0])))
+            if distance == 0:
+                return
+            enfant = noeud[1].get(distance)
+            if enfant is None:
+                noeud[1][distance] = (cle_noeud, {})
+                return
+            noeud = enfant
+
+    def chercher(self, cle_cherchee, tolerance):
+        """Retourne [(distance, clé)] triés par distance"""
+        if self.racine is None:
+            return []
+        trouves, a_visiter = [], [self.racine]
+        while a_visiter:
+            cle_noeud, enfants = a_visiter.pop()
+            distance = levenshtein(cle_cherchee, cle_noeud, max(len(cle_cherchee), len(cle_noeud)))
+            if distance <= tolerance:
+                trouves.append((distance, cle_noeud))
+            for d in range(distance - tolerance, distance + tolerance + 1):
+                if d in enfants:
+                    a_visiter.append(enfants[d])
+        return sorted(trouves)
+
+
+class NameResolver:
+    """Associe un nom saisi au nom canonique d'un joueur"""
+
+    def __init__(self, noms_canoniques):
+        self.par_cle = {}
+        self.par_mot = {}
+        self.arbre = BKTree()
+        for nom in noms_canoniques:
+            k = cle(nom)
+            if not k or k in self.par_cle:
+                continue
+            self.par_cle[k] = nom
+            self.arbre.ajouter(k)
+            for mot in k.split():
+                self.par_mot.setdefault(mot, set()).add(nom)
+
+    @staticmethod
+    def tolerance(k):
+        # 1 faute pour un nom court, jusqu'à 3 pour un nom complet
+        return min(3, max(1, len(k) // 6))
+
+    def resoudre(self, saisi):
+        k = cle(saisi)
+        if not k:
+            return Resolution(saisi, None, 'vide', [])
+
+        exact = self.par_cle.get(k)
+        if exact:
+            return Resolution(saisi, exact, 'exact', [exact])
+
+        # Tous les mots saisis apparaissent dans un seul nom canonique
+        # (« Jerome Casabon » -> « Jérome Casabon Perso »).
+        ensembles = [self.par_mot.get(mot, set()) for mot in k.split()]
+        contenants = set.intersection(*ensembles) if ensembles else set()
+        if len(contenants) == 1:
+            nom = next(iter(contenants))
+            return Resolution(saisi, nom, 'mots', [nom])
+        if len(contenants) > 1:
+            return Resolution(saisi, None, 'ambigu', sorted(contenants))
+
+        proches = self.arbre.chercher(k, self.tolerance(k))
+        if not proches:
+            return Resolution(saisi, None, 'inconnu', [])
+        meilleure = proches[0][0]
+        candidats = sorted(self.par_cle[c] for d, c in proches if d == meilleure)
+        if len(candidats) == 1:
+            return Resolution(saisi, candidats[0], 'approx', candidats)
+        return Resolution(saisi, None, 'ambigu', candidats)
+
+    def resoudre_stats(self, stats_match):
+        """Regroupe les lignes d'un match sous les noms canoniques.
+
+        Les noms ambigus ou inconnus sont conservés tels quels et rapportés
+        pour que l'admin puisse trancher.
+        """
+        stats, corriges, ambigus, nouveaux = {}, [], [], []
+        for saisi, ligne in stats_match.items():
+            resolution = self.resoudre(saisi)
+            nom = resolution.canonique or saisi.strip()
+            if resolution.methode == 'ambigu':
+                ambigus.append(resolution)
+            elif resolution.methode == 'inconnu':
+                nouveaux.append(saisi)
+            elif nom != saisi:
+                corriges.append(resolution)
+
+            total = stats.setdefault(nom, {'buts': 0, 'passes': 0})
+            total['buts'] += int(ligne.get('buts', 0))
+            total['passes'] += int(ligne.get('passes', 0))
+        return ResultatIngestion(stats, corriges, ambigus, nouveaux)
+
+
+def charger_noms_canoniques(dossier):
+    """Tous les joueurs ayant déjà joué, lus dans les totaux de carrière"""
+    return sorted(totaux_carriere(dossier))
+
+
+_resolveurs = {}
+
+
+def _signature(dossier):
+    try:
+        return os.path.getmtime(os.path.join(dossier, 'carriere.json'))
+    except OSError:
+        return None
+
+
+def resolveur_pour_dossier(dossier):
+    """Résolveur reconstruit seulement quand les totaux de carrière changent"""
+    signature = _signature(dossier)
+    cache = _resolveurs.get(dossier)
+    if cache is None or signature is None or cache[0] != signature:
+        noms = charger_noms_canoniques(dossier)
+        cache = (_signature(dossier), NameResolver(noms))
+        _resolveurs[dossier] = cache
+    return cache[1]
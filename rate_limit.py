@@ -0,0 +1,119 @@
+"""
+Limiteur de tentatives de connexion (seau à jetons)
+Les Plombiers Hockey
+
+TokenBucketLimiter garde ses seaux en mémoire : chaque processus a les
+siens, et sous gunicorn la rafale permise est multipliée par le nombre de
+workers. SharedTokenBucketLimiter range les mêmes seaux dans un fichier
+SQLite commun à tous les workers de la machine.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+
+class TokenBucketLimiter:
+    """Un seau de `capacity` jetons par clé (IP, nom d'usager...).
+
+    Chaque tentative consomme un jeton; les jetons reviennent au rythme de
+    `refill_per_second`. Une fois le seau vide, la tentative est refusée
+    avant tout calcul de hachage, ce qui borne le travail CPU par clé.
+    """
+
+    def __init__(self, capacity, refill_per_second, max_keys=10000):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, tokens, updated_at, now):
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+
+    def allow(self, key, cost=1):
+        """Consomme un jeton. Retourne (autorisé, secondes avant le prochain jeton)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+            tokens = self._refill(tokens, updated_at, now)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / self.refill_per_second
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return allowed, retry_after
+
+    def reset(self, key):
+        """Oublie une clé (ex. après une connexion réussie)"""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def _prune(self, now):
+        # Un seau redevenu plein équivaut à une clé jamais vue : on le retire.
+        for key, (tokens, updated_at) in list(self._buckets.items()):
+            if self._refill(tokens, updated_at, now) >= self.capacity:
+                del self._buckets[key]
+        if len(self._buckets) > self.max_keys:
+            oldest = sorted(self._buckets, key=lambda k: self._buckets[k][1])
+            for key in oldest[:len(oldest) - self.max_keys]:
+                del self._buckets[key]
+
+
+class SharedTokenBucketLimiter(TokenBucketLimiter):
+    """Mêmes seaux, partagés entre processus par un fichier SQLite.
+
+    Chaque tentative lit et réécrit son seau dans une transaction
+    BEGIN IMMEDIATE, donc deux workers ne peuvent pas dépenser le même jeton.
+    L'horloge murale remplace time.monotonic(), propre à chaque processus.
+    """
+
+    def __init__(self, path, capacity, refill_per_second, max_keys=10000):
+        super().__init__(capacity, refill_per_second, max_keys)
+        self.path = path
+        self._ready = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            self._ready = True
+        return connection
+
+    def allow(self, key, cost=1):
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+                tokens = self._refill(*row, now) if row else self.capacity
+                if tokens >= cost:
+                    tokens -= cost
+                    allowed, retry_after = True, 0.0
+                else:
+                    allowed, retry_after = False, (cost - tokens) / self.refill_per_second
+                connection.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                                   (key, tokens, now))
+                if connection.execute('SELECT COUNT(*) FROM buckets').fetchone()[0] > self.max_keys:
+                    # Un seau redevenu plein équivaut à une clé jamais vue.
+                    connection.execute('DELETE FROM buckets WHERE updated_at < ?',
+                                       (now - self.capacity / self.refill_per_second,))
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        return allowed, retry_after
+
+    def reset(self, key):
+        with closing(self._connect()) as connection:
+            connection.execute('DELETE FROM buckets WHERE key = ?', (key,))
@@ -0,0 +1,394 @@
+"""
+Saisons et stockage partitionné des matchs
+Les Plombiers Hockey
+
+Chaque saison a son propre dossier : matchs/<saison>/match_AAAA_MM_JJ.json.
+Les totaux par joueur d'une saison sont précalculés dans
+matchs/<saison>/totaux.json à chaque sauvegarde, et les totaux de carrière
+dans matchs/carriere.json : les pages de la saison courante ne lisent jamais
+l'historique, et changer de saison coûte la lecture d'un seul fichier.
+
+matchs/<saison>/manifeste.json liste les matchs de la saison (date, fichier,
+SHA-256, nombre de joueurs, buts et passes) : calendrier et totaux s'en
+servent au lieu de parcourir le dossier, et `verifier` contrôle l'intégrité
+sans analyser un seul match. Le manifeste garde aussi la taille et la date
+de modification de chaque fichier. Une lecture ne coûte que deux stat (le
+manifeste et le dossier de la saison); quand la date du dossier change (match
+ajouté, supprimé ou remplacé hors de l'application, git pull), les fichiers
+sont comparés au manifeste, qui est reconstruit avec les totaux s'ils
+diffèrent. Un fichier réécrit sur place ne touche pas le dossier : `verifier`
+le signale et `recalculer` le prend en compte.
+
+Usage: python saisons.py migrer    # range les anciens matchs/match_*.json
+       python saisons.py recalculer
+       python saisons.py verifier
+"""
+
+import glob
+import hashlib
+import os
+import shutil
+import sys
+import threading
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from agregation import additionner, classer
+from fichiers import ecrire_json, ecrire_json_si_change, empreinte_fichier, lire_json
+
+DOSSIER_MATCHS = 'matchs'
+
+# Bornes de chaque saison (premier et dernier mardi), semaines sans match
+# et premier soir des séries.
+SAISONS = {
+    '2024-2025': {
+        'debut': date(2024, 9, 10),
+        'fin': date(2025, 4, 29),
+        'annules': (date(2024, 12, 24), date(2024, 12, 31)),  # Pause des Fêtes
+        'series': date(2025, 4, 1),
+    },
+}
+
+JourCalendrier = namedtuple('JourCalendrier', ['date', 'match', 'annule', 'series'])
+
+
+def _en_date(valeur):
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    if isinstance(valeur, date):
+        return valeur
+    return datetime.strptime(valeur.replace('_', '-'), '%Y-%m-%d').date()
+
+
+def saison_pour_date(valeur):
+    """Saison d'une date : '2025-04-08' -> '2024-2025'"""
+    jour = _en_date(valeur)
+    for saison, bornes in SAISONS.items():
+        if bornes['debut'] <= jour <= bornes['fin']:
+            return saison
+    # Hors des saisons configurées : une saison commence en août.
+    annee = jour.year if jour.month >= 8 else jour.year - 1
+    return f"{annee}-{annee + 1}"
+
+
+def saisons_disponibles(dossier=DOSSIER_MATCHS):
+    """Saisons configurées ou présentes sur disque, la plus récente en premier"""
+    trouvees = set(SAISONS)
+    if os.path.isdir(dossier):
+        trouvees.update(n for n in os.listdir(dossier)
+                        if os.path.isdir(os.path.join(dossier, n)) and len(n) == 9 and n[4] == '-')
+    return sorted(trouvees, reverse=True)
+
+
+def saisons_jouees(dossier=DOSSIER_MATCHS):
+    """Saisons ayant au moins un match enregistré, la plus récente en premier"""
+    return [saison for saison in saisons_disponibles(dossier) if manifeste(saison, dossier)]
+
+
+def saison_courante(jouees=None, dossier=DOSSIER_MATCHS, aujourdhui=None):
+    """Saison du jour; tant qu'elle n'a aucun match, la dernière saison jouée.
+
+    `jouees` remplace les saisons jouées lues sur disque (l'application y
+    ajoute celles de sa base).
+    """
+    courante = saison_pour_date(aujourdhui or date.today())
+    if jouees is None:
+        jouees = saisons_jouees(dossier)
+    passees = [saison for saison in jouees if saison <= courante]
+    if courante in jouees or not passees:
+        return courante
+    return max(passees)
+
+
+def dossier_saison(saison, dossier=DOSSIER_MATCHS):
+    return os.path.join(dossier, saison)
+
+
+def nom_fichier_match(valeur):
+    return f"match_{_en_date(valeur).strftime('%Y_%m_%d')}.json"
+
+
+def fichier_match(valeur, dossier=DOSSIER_MATCHS):
+    """Chemin du fichier d'un match dans la partition de sa saison"""
+    return os.path.join(dossier_saison(saison_pour_date(valeur), dossier), nom_fichier_match(valeur))
+
+
+def lister_matchs(saison, dossier=DOSSIER_MATCHS):
+    """[(date, chemin)] des fichiers de match d'une saison (parcours du dossier)"""
+    matchs = []
+    for chemin in glob.glob(os.path.join(dossier_saison(saison, dossier), 'match_*.json')):
+        try:
+            matchs.append((_en_date(os.path.basename(chemin)[6:16]), chemin))
+        except ValueError:
+            continue
+    return sorted(matchs)
+
+
+@lru_cache(maxsize=None)
+def _semaines(saison):
+    """((date, annulé, séries), ...) du calendrier configuré, calculé une fois"""
+    bornes = SAISONS.get(saison)
+    if bornes is None:
+        return ()
+    annules = set(bornes.get('annules', ()))
+    series = bornes.get('series')
+    semaines, jour = [], bornes['debut']
+    while jour <= bornes['fin']:
+        semaines.append((jour, jour in annules, series is not None and jour >= series))
+        jour += timedelta(weeks=1)
+    return tuple(semaines)
+
+
+def dates_jouees(saison, dossier=DOSSIER_MATCHS):
+    """Dates ayant un match enregistré, d'après le manifeste"""
+    return frozenset(_en_date(entree['date']) for entree in manifeste(saison, dossier))
+
+
+def calendrier(saison=None, dossier=DOSSIER_MATCHS):
+    """[JourCalendrier] : semaines prévues plus les matchs joués hors calendrier"""
+    saison = saison or saison_courante(dossier=dossier)
+    joues = dates_jouees(saison, dossier)
+    jours = {jour: (annule, series) for jour, annule, series in _semaines(saison)}
+    series = SAISONS.get(saison, {}).get('series')
+    for jour in joues:
+        jours.setdefault(jour, (False, series is not None and jour >= series))
+    return [JourCalendrier(jour, jour in joues, annule, en_series)
+            for jour, (annule, en_series) in sorted(jours.items())]
+
+
+def lire_match(valeur, dossier=DOSSIER_MATCHS):
+    """Statistiques d'un match, ou {} s'il n'existe pas"""
+    return lire_json(fichier_match(valeur, dossier)) or {}
+
+
+_verrou_manifeste = threading.Lock()
+
+
+def sauvegarder_match(valeur, stats_match, dossier=DOSSIER_MATCHS):
+    """Enregistre un match et met à jour le manifeste et les totaux de sa saison et de carrière"""
+    saison = saison_pour_date(valeur)
+    _, sha256 = ecrire_json_si_change(fichier_match(valeur, dossier), stats_match)
+    entree = entree_manifeste(valeur, stats_match, sha256)
+    with _verrou_manifeste:
+        recalculer_manifeste(saison, dossier, {entree['fichier']: entree})
+    recalculer_totaux_saison(saison, dossier)
+    recalculer_totaux_carriere(dossier)
+    return saison
+
+
+def recalculer_totaux_saison(saison, dossier=DOSSIER_MATCHS):
+    """Relit les matchs du manifeste d'une saison (et seulement elle) et précalcule ses totaux"""
+    totaux = {}
+    matchs = manifeste(saison, dossier)
+    for entree in matchs:
+        additionner(totaux, lire_json(os.path.join(dossier_saison(saison, dossier), entree['fichier'])) or {})
+    ecrire_json(os.path.join(dossier_saison(saison, dossier), 'totaux.json'),
+                {'saison': saison, 'matchs': len(matchs), 'version': version_manifeste(matchs),
+                 'joueurs': totaux})
+    return totaux
+
+
+def totaux_saison(saison, dossier=DOSSIER_MATCHS):
+    """Totaux précalculés d'une saison : {nom: {buts, passes, points, matchs}}"""
+    donnees = lire_json(os.path.join(dossier_saison(saison, dossier), 'totaux.json'))
+    if donnees is None or donnees.get('version') != version_manifeste(manifeste(saison, dossier)):
+        # Totaux absents, ou calculés sur un autre manifeste (écriture interrompue).
+        totaux = recalculer_totaux_saison(saison, dossier)
+        recalculer_totaux_carriere(dossier)
+        return totaux
+    return donnees['joueurs']
+
+
+def recalculer_totaux_carriere(dossier=DOSSIER_MATCHS):
+    """Additionne les totaux de chaque saison (sans relire un seul match)"""
+    carriere = {}
+    for saison in saisons_disponibles(dossier):
+        additionner(carriere, totaux_saison(saison, dossier))
+    ecrire_json(os.path.join(dossier, 'carriere.json'), carriere)
+    return carriere
+
+
+def totaux_carriere(dossier=DOSSIER_MATCHS):
+    # Relire les manifestes (un stat par match) suffit à recalculer carriere.json
+    # si un match a changé hors de l'application.
+    for saison in saisons_disponibles(dossier):
+        manifeste(saison, dossier)
+    return lire_json(os.path.join(dossier, 'carriere.json')) or recalculer_totaux_carriere(dossier)
+
+
+def fichier_manifeste(saison, dossier=DOSSIER_MATCHS):
+    return os.path.join(dossier_saison(saison, dossier), 'manifeste.json')
+
+
+def entree_manifeste(valeur, stats_match, sha256):
+    """Ligne de manifeste d'un match : ce qu'on en sait sans ouvrir son fichier"""
+    return {
+        'date': _en_date(valeur).isoformat(),
+        'fichier': nom_fichier_match(valeur),
+        'sha256': sha256,
+        'joueurs': len(stats_match),
+        'buts': sum(int(ligne.get('buts', 0)) for ligne in stats_match.values()),
+        'passes': sum(int(ligne.get('passes', 0)) for ligne in stats_match.values()),
+    }
+
+
+def _ecrire_manifeste(saison, entrees, fichiers, dossier=DOSSIER_MATCHS):
+    entrees = sorted(entrees, key=lambda e: e['date'])
+    ecrire_json(fichier_manifeste(saison, dossier),
+                {'saison': saison, 'matchs': entrees, 'fichiers': [list(f) for f in fichiers]})
+    return entrees
+
+
+def _signature(saison, dossier=DOSSIER_MATCHS):
+    """((fichier, mtime_ns, taille), ...) des matchs présents dans le dossier de la saison"""
+    signature = []
+    for _, chemin in lister_matchs(saison, dossier):
+        try:
+            infos = os.stat(chemin)
+        except OSError:
+            continue
+        signature.append((os.path.basename(chemin), infos.st_mtime_ns, infos.st_size))
+    return tuple(signature)
+
+
+def recalculer_manifeste(saison, dossier=DOSSIER_MATCHS, connues=None):
+    """Reconstruit le manifeste d'une saison à partir des fichiers présents.
+
+    `connues` ({fichier: entrée}) évite de relire les matchs que l'appelant
+    vient d'écrire; les autres fichiers ne sont relus que si leur taille ou
+    leur date de modification a changé depuis le manifeste précédent.
+    """
+    connues = dict(connues or {})
+    precedent = lire_json(fichier_manifeste(saison, dossier)) or {}
+    inchanges = {tuple(f) for f in precedent.get('fichiers', [])}
+    anciennes = {e['fichier']: e for e in precedent.get('matchs', [])}
+    signature = _signature(saison, dossier)
+    entrees = []
+    for nom, mtime, taille in signature:
+        entree = connues.get(nom)
+        if entree is None and (nom, mtime, taille) in inchanges:
+            entree = anciennes.get(nom)
+        if entree is None:
+            chemin = os.path.join(dossier_saison(saison, dossier), nom)
+            entree = entree_manifeste(nom[6:16], lire_json(chemin) or {}, empreinte_fichier(chemin))
+        entrees.append(entree)
+    return _ecrire_manifeste(saison, entrees, signature, dossier)
+
+
+_manifestes = {}  # chemin du manifeste -> (mtime manifeste, mtime dossier, entrées)
+
+
+def version_manifeste(entrees):
+    """Empreinte courte d'un manifeste : change dès qu'un match change"""
+    return hashlib.sha256(''.join(e['sha256'] for e in entrees).encode()).hexdigest()[:16]
+
+
+def manifeste(saison, dossier=DOSSIER_MATCHS):
+    """Entrées du manifeste d'une saison triées par date.
+
+    Relu seulement si le manifeste a changé. Les fichiers de match ne sont
+    comparés au manifeste (un stat chacun) que lorsque la date du dossier de
+    la saison a bougé; s'ils diffèrent, le manifeste et les totaux de la
+    saison et de carrière sont reconstruits.
+    """
+    chemin = fichier_manifeste(saison, dossier)
+    try:
+        mtime_dossier = os.stat(dossier_saison(saison, dossier)).st_mtime_ns
+    except OSError:
+        return []
+    try:
+        mtime = os.stat(chemin).st_mtime_ns
+    except OSError:
+        mtime = None
+    cache = _manifestes.get(chemin)
+    if cache is not None and cache[0] == mtime and cache[1] == mtime_dossier:
+        return cache[2]
+
+    donnees = lire_json(chemin) if mtime is not None else None
+    dossier_change = cache is None or cache[1] != mtime_dossier
+    if donnees is None or (dossier_change and
+                           tuple(tuple(f) for f in donnees.get('fichiers', ())) != _signature(saison, dossier)):
+        recalculer_manifeste(saison, dossier)
+        recalculer_totaux_saison(saison, dossier)
+        recalculer_totaux_carriere(dossier)
+        return manifeste(saison, dossier)
+    _manifestes[chemin] = (mtime, mtime_dossier, donnees['matchs'])
+    return donnees['matchs']
+
+
+def verifier_saison(saison, dossier=DOSSIER_MATCHS):
+    """Compare manifeste, fichiers et totaux d'une saison. Retourne la liste des anomalies"""
+    anomalies = []
+    entrees = manifeste(saison, dossier)
+    references = {e['fichier'] for e in entrees}
+    for entree in entrees:
+        chemin = os.path.join(dossier_saison(saison, dossier), entree['fichier'])
+        sha256 = empreinte_fichier(chemin)
+        if sha256 is None:
+            anomalies.append(f"{entree['fichier']} : fichier manquant")
+        elif sha256 != entree['sha256']:
+            anomalies.append(f"{entree['fichier']} : modifié hors de l'application")
+    for _, chemin in lister_matchs(saison, dossier):
+        if os.path.basename(chemin) not in references:
+            anomalies.append(f"{os.path.basename(chemin)} : absent du manifeste")
+
+    totaux = lire_json(os.path.join(dossier_saison(saison, dossier), 'totaux.json'))
+    if totaux is not None:
+        if totaux['matchs'] != len(entrees):
+            anomalies.append(f"totaux.json : {totaux['matchs']} matchs, manifeste : {len(entrees)}")
+        for cle in ('buts', 'passes'):
+            attendu = sum(e[cle] for e in entrees)
+            obtenu = sum(j[cle] for j in totaux['joueurs'].values())
+            if attendu != obtenu:
+                anomalies.append(f"totaux.json : {obtenu} {cle}, manifeste : {attendu}")
+    return anomalies
+
+
+def classement(saison=None, dossier=DOSSIER_MATCHS):
+    """[(nom, stats)] triés par points, buts puis nom; saison=None pour la carrière"""
+    return classer(totaux_carriere(dossier) if saison is None else totaux_saison(saison, dossier))
+
+
+def migrer_dossier_plat(dossier=DOSSIER_MATCHS):
+    """Déplace les anciens matchs/match_*.json dans leur dossier de saison"""
+    deplaces = []
+    for chemin in glob.glob(os.path.join(dossier, 'match_*.json')):
+        nom = os.path.basename(chemin)
+        try:
+            cible = fichier_match(nom[6:16], dossier)
+        except ValueError:
+            continue
+        os.makedirs(os.path.dirname(cible), exist_ok=True)
+        shutil.move(chemin, cible)
+        deplaces.append(cible)
+    return deplaces
+
+
+def recalculer_tout(dossier=DOSSIER_MATCHS):
+    for saison in saisons_disponibles(dossier):
+        recalculer_manifeste(saison, dossier)
+        recalculer_totaux_saison(saison, dossier)
+    return recalculer_totaux_carriere(dossier)
+
+
+if __name__ == '__main__':
+    commande = sys.argv[1] if len(sys.argv) > 1 else 'recalculer'
+    if commande == 'migrer':
+        for cible in migrer_dossier_plat():
+            print(f"📁 {cible}")
+        recalculer_tout()
+    elif commande == 'recalculer':
+        carriere = recalculer_tout()
+        print(f"✅ Totaux recalculés : {len(saisons_disponibles())} saison(s), {len(carriere)} joueurs")
+    elif commande == 'verifier':
+        erreurs = 0
+        for saison in saisons_disponibles():
+            anomalies = verifier_saison(saison)
+            erreurs += len(anomalies)
+            print(f"{'❌' if anomalies else '✅'} {saison} : {len(manifeste(saison))} matchs")
+            for anomalie in anomalies:
+                print(f"   - {anomalie}")
+        sys.exit(1 if erreurs else 0)
+    else:
+        print(__doc__)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Mesure le coût des méthodes de hachage des mots de passe (Werkzeug)
+Les Plombiers Hockey
+
+Aide à choisir PASSWORD_HASH_METHOD : une connexion légitime devrait rester
+sous ~250 ms, et le limiteur de /auth/login borne le nombre de hachages
+qu'un attaquant peut forcer par minute.
+
+Usage: python scripts/bench_password_hash.py [--rounds 5] [--methods scrypt:32768:8:1,pbkdf2:sha256:600000]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+METHODES = [
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+]
+
+
+def mesurer(methode, tours):
+    empreinte = generate_password_hash('plomberie', method=methode)
+    durees = []
+    for _ in range(tours):
+        debut = time.perf_counter()
+        check_password_hash(empreinte, 'mauvais-mot-de-passe')
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--methods', default=','.join(METHODES))
+    parser.add_argument('--per-minute', type=float, default=float(os.environ.get('LOGIN_RATE_PER_MINUTE', 5)),
+                        help='débit du limiteur (LOGIN_RATE_PER_MINUTE)')
+    args = parser.parse_args()
+
+    print(f"🔐 {args.rounds} vérifications par méthode, limiteur à {args.per_minute:g}/min par clé")
+    print(f"{'méthode':<24}{'ms/hash':>10}{'hash/s/cœur':>14}{'CPU s/min/IP':>15}")
+    for methode in args.methods.split(','):
+        duree = mesurer(methode, args.rounds)
+        print(f"{methode:<24}{duree * 1000:>10.1f}{1 / duree:>14.1f}{duree * args.per_minute:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Mesure l'attente des lecteurs pendant les écritures admin (SQLite)
+Les Plombiers Hockey
+
+Un thread « admin » enchaîne des transactions d'écriture sur la table
+players pendant que plusieurs lecteurs exécutent la requête du classement.
+On compare le journal classique (DELETE) au mode WAL configuré dans app.py.
+
+Usage: python scripts/bench_sqlite_wal.py [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+PRAGMAS = {
+    'DELETE': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 5000},
+    'WAL': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 5000,
+            'mmap_size': 64 * 1024 * 1024},
+}
+
+NB_JOUEURS = 5000
+
+
+def connecter(chemin, pragmas):
+    connexion = sqlite3.connect(chemin, timeout=pragmas['busy_timeout'] / 1000, isolation_level=None)
+    for nom, valeur in pragmas.items():
+        connexion.execute(f'PRAGMA {nom}={valeur}')
+    return connexion
+
+
+def preparer(chemin, pragmas):
+    connexion = connecter(chemin, pragmas)
+    connexion.execute('CREATE TABLE players (id INTEGER PRIMARY KEY, name TEXT, goals INT, assists INT, bio TEXT)')
+    connexion.executemany(
+        'INSERT INTO players (name, goals, assists, bio) VALUES (?, ?, ?, ?)',
+        ((f'Joueur {i}', i % 17, i % 11, 'x' * 400) for i in range(NB_JOUEURS)))
+    connexion.close()
+
+
+def ecrivain(chemin, pragmas, arret, compteur):
+    connexion = connecter(chemin, pragmas)
+    connexion.execute('PRAGMA cache_size=50')
+    while not arret.is_set():
+        connexion.execute('BEGIN IMMEDIATE')
+        connexion.execute("UPDATE players SET goals = goals + 1, bio = bio || '' WHERE id % 3 = ?",
+                          (compteur[0] % 3,))
+        time.sleep(0.02)
+        connexion.execute('COMMIT')
+        compteur[0] += 1
+    connexion.close()
+
+
+def lecteur(chemin, pragmas, arret, latences, erreurs):
+    connexion = connecter(chemin, pragmas)
+    while not arret.is_set():
+        debut = time.perf_counter()
+        try:
+            connexion.execute(
+                'SELECT id, name, goals + assists AS points FROM players ORDER BY points DESC LIMIT 20'
+            ).fetchall()
+            latences.append(time.perf_counter() - debut)
+        except sqlite3.OperationalError:
+            erreurs.append(1)
+    connexion.close()
+
+
+def mesurer(mode, secondes, nb_lecteurs):
+    pragmas = PRAGMAS[mode]
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, 'bench.db')
+        preparer(chemin, pragmas)
+
+        arret = threading.Event()
+        latences, erreurs, ecritures = [], [], [0]
+        threads = [threading.Thread(target=ecrivain, args=(chemin, pragmas, arret, ecritures))]
+        threads += [threading.Thread(target=lecteur, args=(chemin, pragmas, arret, latences, erreurs))
+                    for _ in range(nb_lecteurs)]
+        for t in threads:
+            t.start()
+        time.sleep(secondes)
+        arret.set()
+        for t in threads:
+            t.join()
+
+    latences.sort()
+    return {
+        'mode': mode,
+        'lectures': len(latences) / secondes,
+        'ecritures': ecritures[0] / secondes,
+        'p50': statistics.median(latences) * 1000,
+        'p99': latences[min(len(latences) - 1, int(len(latences) * 0.99))] * 1000,
+        'max': latences[-1] * 1000,
+        'erreurs': len(erreurs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"🏒 {args.readers} lecteurs + 1 admin pendant {args.seconds}s, {NB_JOUEURS} joueurs")
+    print(f"{'mode':<8}{'lect/s':>10}{'écr/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'erreurs':>9}")
+    for mode in ('DELETE', 'WAL'):
+        r = mesurer(mode, args.seconds, args.readers)
+        print(f"{r['mode']:<8}{r['lectures']:>10.0f}{r['ecritures']:>8.1f}{r['p50']:>9.2f}"
+              f"{r['p99']:>9.2f}{r['max']:>9.2f}{r['erreurs']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Mesure le chargement des templates au démarrage d'un worker
+Les Plombiers Hockey
+
+Simule un worker neuf (environnement Jinja vide) et charge tous les
+templates, d'abord en les analysant et compilant, puis depuis le cache de
+bytecode rempli par scripts/precompile_templates.py. Comme ce dernier,
+l'application est importée avec INIT_DATABASE=false.
+
+Usage: python scripts/bench_templates.py [--rounds 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Seuls les templates servent : pas de base créée ni de connexion (voir Config.INIT_DATABASE).
+os.environ['INIT_DATABASE'] = 'false'
+
+from jinja2 import FileSystemBytecodeCache  # noqa: E402
+
+from app import app  # noqa: E402
+
+
+def charger_tout(cache):
+    """Temps (ms) pour qu'un environnement neuf charge chaque template"""
+    options = {k: v for k, v in app.jinja_options.items() if k != 'bytecode_cache'}
+    if cache is not None:
+        options['bytecode_cache'] = cache
+    app.jinja_options = options
+    environnement = app.create_jinja_environment()
+    debut = time.perf_counter()
+    for nom in environnement.list_templates():
+        environnement.get_template(nom)
+    return (time.perf_counter() - debut) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    originales = app.jinja_options
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = FileSystemBytecodeCache(dossier)
+        charger_tout(cache)  # précompilation
+        sans_cache = [charger_tout(None) for _ in range(args.rounds)]
+        avec_cache = [charger_tout(cache) for _ in range(args.rounds)]
+    app.jinja_options = originales
+
+    nombre = len(app.jinja_env.list_templates())
+    print(f"🏒 {nombre} templates, {args.rounds} démarrages simulés")
+    print(f"{'mode':<16}{'médiane ms':>12}{'max ms':>10}")
+    for mode, temps in (('compilation', sans_cache), ('bytecode', avec_cache)):
+        print(f"{mode:<16}{statistics.median(temps):>12.1f}{max(temps):>10.1f}")
+    print(f"Gain: x{statistics.median(sans_cache) / statistics.median(avec_cache):.1f}")
+
+
+if __name__ == '__main__':
+    main()
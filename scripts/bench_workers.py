@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compare les classes de workers gunicorn (sync, gthread, gevent)
+Les Plombiers Hockey
+
+Pour chaque classe, on démarre gunicorn avec 2 workers, on ouvre des
+connexions lentes (formulaires de connexion envoyés au compte-gouttes, comme
+un téléphone sur le réseau de l'aréna), puis on mesure combien de requêtes
+rapides passent encore. Un worker sync ou un thread gthread reste bloqué à
+lire le corps de la requête; sous gevent, seul un greenlet attend.
+
+Les connexions lentes n'utilisent pas /api/live, refusé (503) hors gevent.
+
+Usage: python scripts/bench_workers.py [--slow 8] [--requests 200] [--classes sync,gthread,gevent]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def port_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def demarrer_gunicorn(worker_class, port, dossier):
+    env = dict(os.environ,
+               PORT=str(port),
+               WEB_WORKER_CLASS=worker_class,
+               WEB_CONCURRENCY='2',
+               WEB_THREADS='8',
+               DATABASE_URL=f"sqlite:///{os.path.join(dossier, 'bench.db')}",
+               LIVE_EVENTS_DB=os.path.join(dossier, 'live_events.db'),
+               LOGIN_RATE_DB=os.path.join(dossier, 'rate_limit.db'),
+               PYTHONPATH=RACINE)
+    processus = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '-c', os.path.join(RACINE, 'gunicorn.conf.py'),
+         '--access-logfile', os.devnull],
+        cwd=dossier, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    limite = time.time() + 20
+    while time.time() < limite:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                time.sleep(1)
+                return processus
+        except OSError:
+            time.sleep(0.2)
+    processus.kill()
+    raise RuntimeError(f"gunicorn ({worker_class}) n'a pas démarré")
+
+
+def ouvrir_connexion_lente(port):
+    """Formulaire de connexion annoncé en entier mais dont le corps n'arrive jamais"""
+    s = socket.create_connection(('127.0.0.1', port), timeout=5)
+    s.sendall(b'POST /auth/login HTTP/1.1\r\nHost: localhost\r\n'
+              b'Content-Type: application/x-www-form-urlencoded\r\nContent-Length: 4096\r\n\r\n'
+              b'username=')
+    return s
+
+
+def requete_rapide(port, chemin):
+    debut = time.perf_counter()
+    try:
+        connexion = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connexion.request('GET', chemin)
+        reponse = connexion.getresponse()
+        reponse.read()
+        connexion.close()
+        return time.perf_counter() - debut, reponse.status < 500
+    except OSError:
+        return time.perf_counter() - debut, False
+
+
+def mesurer(worker_class, nb_lentes, nb_requetes, chemin):
+    port = port_libre()
+    with tempfile.TemporaryDirectory() as dossier:
+        processus = demarrer_gunicorn(worker_class, port, dossier)
+        lentes = []
+        try:
+            lentes = [ouvrir_connexion_lente(port) for _ in range(nb_lentes)]
+            time.sleep(0.5)
+
+            debut = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=32) as pool:
+                resultats = list(pool.map(lambda _: requete_rapide(port, chemin), range(nb_requetes)))
+            duree = time.perf_counter() - debut
+        finally:
+            for s in lentes:
+                s.close()
+            processus.terminate()
+            try:
+                processus.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                processus.kill()
+                processus.wait()
+
+    latences = sorted(t for t, ok in resultats if ok)
+    erreurs = sum(1 for _, ok in resultats if not ok)
+    return {
+        'classe': worker_class,
+        'debit': len(latences) / duree if duree else 0,
+        'p50': statistics.median(latences) * 1000 if latences else float('nan'),
+        'p95': latences[min(len(latences) - 1, int(len(latences) * 0.95))] * 1000 if latences else float('nan'),
+        'erreurs': erreurs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slow', type=int, default=8, help='connexions lentes ouvertes pendant la mesure')
+    parser.add_argument('--requests', type=int, default=200, help='requêtes rapides à envoyer')
+    parser.add_argument('--classes', default='sync,gthread,gevent')
+    parser.add_argument('--path', default='/api/standings')
+    args = parser.parse_args()
+
+    print(f"🏒 {args.slow} connexions lentes + {args.requests} requêtes sur {args.path}")
+    print(f"{'classe':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'erreurs':>10}")
+    for worker_class in args.classes.split(','):
+        if worker_class == 'gevent':
+            try:
+                import gevent  # noqa: F401
+            except ImportError:
+                print(f"{worker_class:<10}  (gevent non installé, ignoré)")
+                continue
+        r = mesurer(worker_class, args.slow, args.requests, args.path)
+        print(f"{r['classe']:<10}{r['debit']:>10.1f}{r['p50']:>10.1f}{r['p95']:>10.1f}{r['erreurs']:>10}")
+
+
+if __name__ == '__main__':
+    main()
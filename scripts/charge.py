@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Test de charge : un soir de match simulé
+Les Plombiers Hockey
+
+Des fans virtuels enchaînent des requêtes avec un temps de réflexion
+aléatoire, selon le mélange d'un soir de match : surtout l'accueil et les
+fiches de joueurs, le podium (/api/standings?limit=3), quelques scores
+saisis par l'admin (admin_add_match) et des exports CSV. Comme la page
+d'accueil ouvre /api/live, une part des fans (--part-direct) garde ce flux
+ouvert pendant tout le palier, en plus de ses clics.
+
+Par défaut le script démarre gunicorn en local sur une base SQLite neuve
+(remplie de joueurs via l'admin), puis monte par paliers de fans. Pour
+chaque palier : débit, p50/p95/p99 et taux d'erreurs par route. Le dernier
+palier qui tient l'objectif (--p95-max, --erreurs-max) donne le nombre de
+fans soutenables par worker.
+
+Contre une instance existante (--url), rien n'est écrit : ni effectif
+ajouté, ni score saisi, sauf avec --ecritures.
+
+Avec --enregistrer, les mesures du dernier palier servent de référence; avec
+--reference, le script échoue (code 1) si le p95 d'une route dépasse celui
+de la référence de plus de --tolerance.
+
+Usage: python scripts/charge.py [--fans 10,25,50,100] [--duree 30] [--workers 2]
+       python scripts/charge.py --url http://127.0.0.1:5000 --workers 4 [--ecritures]
+       python scripts/charge.py --enregistrer charge_reference.json
+       python scripts/charge.py --reference charge_reference.json --tolerance 0.25
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode, urlsplit
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADVERSAIRES = ('Les Castors', 'Les Draveurs', 'Le Blizzard', 'Les Riverains', 'Les Gaillards')
+POSITIONS = ('Centre', 'Ailier gauche', 'Ailier droit', 'Défenseur', 'Gardien')
+
+
+def port_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def demarrer_gunicorn(port, dossier, workers, worker_class, threads):
+    env = dict(os.environ,
+               PORT=str(port),
+               WEB_WORKER_CLASS=worker_class,
+               WEB_CONCURRENCY=str(workers),
+               WEB_THREADS=str(threads),
+               DATABASE_URL=f"sqlite:///{os.path.join(dossier, 'charge.db')}",
+               LIVE_EVENTS_DB=os.path.join(dossier, 'live_events.db'),
+               LOGIN_RATE_DB=os.path.join(dossier, 'rate_limit.db'),
+               PYTHONPATH=RACINE)
+    processus = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '-c', os.path.join(RACINE, 'gunicorn.conf.py'),
+         '--access-logfile', os.devnull],
+        cwd=RACINE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    limite = time.time() + 30
+    while time.time() < limite:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                time.sleep(1)
+                return processus
+        except OSError:
+            time.sleep(0.2)
+    processus.kill()
+    raise RuntimeError("gunicorn n'a pas démarré")
+
+
+class Client:
+    """Connexion HTTP persistante d'un fan, avec ses cookies"""
+
+    def __init__(self, hote, port, cookies='', timeout=10):
+        self.hote, self.port, self.timeout = hote, port, timeout
+        self.cookies = cookies
+        self.connexion = None
+
+    def requete(self, methode, chemin, formulaire=None):
+        """(statut, en-têtes, corps); statut 0 si la connexion a échoué"""
+        entetes = {'Cookie': self.cookies} if self.cookies else {}
+        corps = None
+        if formulaire is not None:
+            corps = urlencode(formulaire)
+            entetes['Content-Type'] = 'application/x-www-form-urlencoded'
+        for essai in (1, 2):
+            if self.connexion is None:
+                self.connexion = http.client.HTTPConnection(self.hote, self.port, timeout=self.timeout)
+            try:
+                self.connexion.request(methode, chemin, body=corps, headers=entetes)
+                reponse = self.connexion.getresponse()
+                return reponse.status, reponse.msg, reponse.read()
+            except (OSError, http.client.HTTPException):
+                self.fermer()
+                # Une connexion gardée ouverte a pu être fermée par le serveur
+                # (keepalive); on ne réessaie qu'une fois.
+                if essai == 2:
+                    return 0, None, b''
+
+    def fermer(self):
+        if self.connexion is not None:
+            self.connexion.close()
+            self.connexion = None
+
+
+def connecter_admin(hote, port, utilisateur, mot_de_passe):
+    """Cookies d'une session admin, partagée par tous les fans (une seule connexion
+    pour ne pas déclencher la limite de tentatives de login)"""
+    client = Client(hote, port)
+    statut, entetes, _ = client.requete('POST', '/auth/login',
+                                     {'username': utilisateur, 'password': mot_de_passe})
+    client.fermer()
+    if statut != 302 or '/admin' not in (entetes.get('Location') or ''):
+        raise RuntimeError(f"Connexion admin refusée (HTTP {statut})")
+    return '; '.join(c.split(';', 1)[0] for c in entetes.get_all('Set-Cookie') or [])
+
+
+def ids_joueurs(client):
+    ids, apres = [], None
+    while True:
+        chemin = '/api/players?fields=id&limit=100' + (f'&after={apres}' if apres else '')
+        statut, _, corps = client.requete('GET', chemin)
+        if statut != 200:
+            raise RuntimeError(f"/api/players a répondu HTTP {statut}")
+        page = json.loads(corps)
+        ids.extend(ligne['id'] for ligne in page['data'])
+        apres = page['next']
+        if not apres:
+            return ids
+
+
+def remplir_effectif(client, nombre):
+    """Ajoute des joueurs par l'admin pour que /player/<id> ait de quoi servir"""
+    rng = random.Random(7)
+    for numero in range(1, nombre + 1):
+        client.requete('POST', '/admin/players/add', {
+            'name': f'Joueur {numero:02d}', 'position': rng.choice(POSITIONS),
+            'jersey_number': str(numero), 'age': str(rng.randint(19, 45)), 'height': '',
+            'weight': '', 'hometown': 'Québec', 'goals': str(rng.randint(0, 30)),
+            'assists': str(rng.randint(0, 30)), 'penalty_minutes': '0',
+            'games_played': str(rng.randint(1, 25)), 'plus_minus': '0', 'bio': 'x' * 400,
+        })
+
+
+# --- Profil d'un soir de match -------------------------------------------------
+
+def accueil(client, rng, ids):
+    return client.requete('GET', '/')
+
+
+def fiche_joueur(client, rng, ids):
+    return client.requete('GET', f'/player/{rng.choice(ids)}')
+
+
+def podium(client, rng, ids):
+    return client.requete('GET', '/api/standings?limit=3')
+
+
+def saisie_score(client, rng, ids):
+    jour = time.strftime('%Y-%m-%d')
+    return client.requete('POST', '/admin/matches/add', {
+        'date': jour, 'opponent': rng.choice(ADVERSAIRES), 'home_game': 'on',
+        'our_score': str(rng.randint(0, 8)), 'opponent_score': str(rng.randint(0, 8)),
+        'venue': 'Aréna', 'notes': 'test de charge',
+    })
+
+
+def export_csv(client, rng, ids):
+    return client.requete('GET', '/admin/export/players')
+
+
+# (route, poids, action, demande la session admin, écrit dans la base)
+PROFIL = [
+    ('/', 35, accueil, False, False),
+    ('/player/<id>', 35, fiche_joueur, False, False),
+    ('/api/standings', 20, podium, False, False),
+    ('admin_add_match', 6, saisie_score, True, True),
+    ('/admin/export/players', 4, export_csv, True, False),
+]
+DIRECT = '/api/live'
+
+
+def ecouter_direct(hote, port, fin, timeout, mesures):
+    """Garde /api/live ouvert jusqu'à la fin du palier, comme un onglet d'accueil.
+
+    Mesure le délai jusqu'aux en-têtes; une coupure avant la fin compte comme
+    une erreur. Un socket brut permet de relâcher le flux à l'heure dite.
+    """
+    debut = time.perf_counter()
+    try:
+        connexion = socket.create_connection((hote, port), timeout=timeout)
+    except OSError:
+        mesures.append((DIRECT, time.perf_counter() - debut, 0, False))
+        return
+    statut, recu = 0, b''
+    try:
+        connexion.sendall(f'GET {DIRECT} HTTP/1.1\r\nHost: {hote}\r\nAccept: text/event-stream\r\n\r\n'.encode())
+        while b'\r\n\r\n' not in recu:
+            morceau = connexion.recv(4096)
+            if not morceau:
+                break
+            recu += morceau
+        ligne = recu.split(b'\r\n', 1)[0].split()
+        statut = int(ligne[1]) if len(ligne) > 1 and ligne[1].isdigit() else 0
+        mesures.append((DIRECT, time.perf_counter() - debut, statut, statut == 200))
+        if statut != 200:
+            return
+        connexion.settimeout(1)
+        while time.monotonic() < fin:
+            try:
+                if not connexion.recv(4096):
+                    mesures.append((DIRECT, 0, 0, False))
+                    return
+            except socket.timeout:
+                continue
+    except OSError:
+        if not statut:
+            mesures.append((DIRECT, time.perf_counter() - debut, 0, False))
+    finally:
+        connexion.close()
+
+
+def reussie(statut, entetes, admin):
+    if statut == 0 or statut >= 400:
+        return False
+    # Une session admin perdue se voit comme une redirection vers le login.
+    return not (admin and statut == 302 and '/auth/login' in (entetes.get('Location') or ''))
+
+
+def fan(hote, port, cookies, ids, fin, reflexion, graine, mesures, timeout, profil, part_direct):
+    rng = random.Random(graine)
+    public, admin = Client(hote, port, timeout=timeout), Client(hote, port, cookies, timeout=timeout)
+    routes = [p[0] for p in profil]
+    poids = [p[1] for p in profil]
+    actions = {p[0]: p for p in profil}
+    direct = None
+    if rng.random() < part_direct:
+        direct = threading.Thread(target=ecouter_direct, args=(hote, port, fin, timeout, mesures), daemon=True)
+        direct.start()
+    try:
+        while time.monotonic() < fin:
+            route = rng.choices(routes, poids)[0]
+            _, _, action, demande_admin, _ = actions[route]
+            debut = time.perf_counter()
+            statut, entetes, _ = action(admin if demande_admin else public, rng, ids)
+            mesures.append((route, time.perf_counter() - debut, statut,
+                            reussie(statut, entetes, demande_admin)))
+            time.sleep(min(rng.expovariate(1 / reflexion), reflexion * 5) if reflexion else 0)
+    finally:
+        public.fermer()
+        admin.fermer()
+        if direct:
+            direct.join()
+
+
+def centile(valeurs, p):
+    """Centile par rang le plus proche sur une liste triée"""
+    if not valeurs:
+        return float('nan')
+    return valeurs[min(len(valeurs) - 1, max(0, int(round(p / 100 * len(valeurs))) - 1))]
+
+
+def resumer(mesures, duree):
+    par_route = {}
+    for route, latence, statut, ok in mesures:
+        par_route.setdefault(route, []).append((latence, statut, ok))
+    par_route['*'] = [(latence, statut, ok) for _, latence, statut, ok in mesures]
+    resume = {}
+    for route, lignes in par_route.items():
+        latences = sorted(latence * 1000 for latence, _, _ in lignes)
+        erreurs = sum(1 for _, _, ok in lignes if not ok)
+        resume[route] = {
+            'requetes': len(lignes),
+            'debit': len(lignes) / duree if duree else 0,
+            'p50': centile(latences, 50),
+            'p95': centile(latences, 95),
+            'p99': centile(latences, 99),
+            'erreurs': erreurs / len(lignes) * 100 if lignes else 0,
+            'codes': dict(Counter(str(statut) for _, statut, ok in lignes if not ok)),
+        }
+    return resume
+
+
+def palier(hote, port, cookies, ids, nb_fans, duree, montee, reflexion, timeout, profil, part_direct):
+    mesures = []  # list.append est atomique : une liste partagée suffit
+    debut = time.monotonic()
+    fin = debut + montee + duree
+    fils = []
+    for numero in range(nb_fans):
+        # Les fans arrivent au fil de la montée, comme avant la mise au jeu.
+        depart = debut + montee * numero / max(nb_fans, 1)
+        time.sleep(max(0, depart - time.monotonic()))
+        f = threading.Thread(target=fan, args=(hote, port, cookies, ids, fin, reflexion, numero,
+                                               mesures, timeout, profil, part_direct), daemon=True)
+        f.start()
+        fils.append(f)
+    for f in fils:
+        f.join()
+    return resumer(mesures, time.monotonic() - debut)
+
+
+def afficher(nb_fans, resume):
+    print(f"\n👥 {nb_fans} fans")
+    print(f"{'route':<24}{'req':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err %':>8}")
+    for route in [p[0] for p in PROFIL] + [DIRECT, '*']:
+        r = resume.get(route)
+        if not r:
+            continue
+        codes = ' ' + ','.join(f'{c}×{n}' for c, n in sorted(r['codes'].items())) if r['codes'] else ''
+        print(f"{'total' if route == '*' else route:<24}{r['requetes']:>7}{r['debit']:>9.1f}"
+              f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}{r['erreurs']:>8.2f}{codes}")
+
+
+def regressions(resume, reference, tolerance):
+    messages = []
+    for route, ref in reference['routes'].items():
+        actuel = resume.get(route)
+        if not actuel or not ref['requetes']:
+            continue
+        if actuel['p95'] > ref['p95'] * (1 + tolerance):
+            messages.append(f"{route} : p95 {actuel['p95']:.1f} ms (référence {ref['p95']:.1f} ms)")
+        if actuel['erreurs'] > ref['erreurs'] + tolerance * 10:
+            messages.append(f"{route} : {actuel['erreurs']:.2f} % d'erreurs (référence {ref['erreurs']:.2f} %)")
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="instance déjà démarrée (sinon gunicorn local sur une base neuve)")
+    parser.add_argument('--fans', default='10,25,50,100', help='paliers de fans simultanés')
+    parser.add_argument('--duree', type=float, default=30, help='secondes mesurées par palier')
+    parser.add_argument('--montee', type=float, default=5, help='secondes pour que tous les fans arrivent')
+    parser.add_argument('--reflexion', type=float, default=1.0, help='temps moyen entre deux clics (s)')
+    parser.add_argument('--part-direct', type=float, default=0.8,
+                        help='part des fans qui gardent /api/live ouvert (0 à 1)')
+    parser.add_argument('--ecritures', action='store_true',
+                        help="avec --url, permet de saisir des scores et de remplir l'effectif")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='gevent')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--joueurs', type=int, default=40, help='joueurs créés dans la base locale')
+    parser.add_argument('--admin', default='admin')
+    parser.add_argument('--mot-de-passe', default=os.environ.get('ADMIN_PASSWORD', 'admin123'))
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--p95-max', type=float, default=500, help='objectif de p95 global (ms)')
+    parser.add_argument('--erreurs-max', type=float, default=1.0, help="objectif de taux d'erreurs (%%)")
+    parser.add_argument('--enregistrer', help='écrit les mesures du dernier palier comme référence')
+    parser.add_argument('--reference', help='compare le dernier palier à cette référence')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='hausse de p95 tolérée (0.25 = +25 %%)')
+    args = parser.parse_args()
+
+    paliers = [int(n) for n in args.fans.split(',') if n.strip()]
+    # Une instance passée par --url peut être la production : pas d'écriture sans accord.
+    ecritures = args.ecritures or not args.url
+    profil = [p for p in PROFIL if ecritures or not p[4]]
+    processus, dossier = None, None
+    if args.url:
+        cible = urlsplit(args.url)
+        hote, port = cible.hostname, cible.port or 80
+    else:
+        dossier = tempfile.TemporaryDirectory()
+        hote, port = '127.0.0.1', port_libre()
+        processus = demarrer_gunicorn(port, dossier.name, args.workers, args.worker_class, args.threads)
+
+    try:
+        cookies = connecter_admin(hote, port, args.admin, args.mot_de_passe)
+        client = Client(hote, port, cookies)
+        ids = ids_joueurs(client)
+        if not ids and ecritures:
+            remplir_effectif(client, args.joueurs)
+            ids = ids_joueurs(client)
+        client.fermer()
+        if not ids:
+            parser.error("aucun joueur actif : /player/<id> ne peut pas être testé")
+
+        print(f"🏒 {args.url or f'gunicorn local ({args.workers} × {args.worker_class})'}, "
+              f"{len(ids)} joueurs, {args.duree:.0f} s par palier, "
+              f"{args.part_direct:.0%} des fans sur {DIRECT}")
+        if not ecritures:
+            print(f"   lecture seule : {', '.join(p[0] for p in PROFIL if p[4])} exclu (--ecritures pour l'inclure)")
+        tenus, resume = [], None
+        for nb_fans in paliers:
+            resume = palier(hote, port, cookies, ids, nb_fans, args.duree, args.montee,
+                            args.reflexion, args.timeout, profil, args.part_direct)
+            afficher(nb_fans, resume)
+            total = resume['*']
+            if total['p95'] <= args.p95_max and total['erreurs'] <= args.erreurs_max:
+                tenus.append(nb_fans)
+    finally:
+        if processus:
+            processus.terminate()
+            try:
+                processus.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                processus.kill()
+                processus.wait()
+            dossier.cleanup()
+
+    print()
+    if tenus:
+        maximum = max(tenus)
+        print(f"✅ Objectif tenu jusqu'à {maximum} fans (p95 ≤ {args.p95_max:.0f} ms, "
+              f"erreurs ≤ {args.erreurs_max} %) : ~{maximum / args.workers:.0f} fans par worker")
+        if maximum == paliers[-1]:
+            print("   (dernier palier testé : ajouter des paliers plus hauts pour trouver la limite)")
+    else:
+        print(f"❌ Objectif manqué dès {paliers[0]} fans (p95 ≤ {args.p95_max:.0f} ms, erreurs ≤ {args.erreurs_max} %)")
+
+    if args.enregistrer:
+        with open(args.enregistrer, 'w', encoding='utf-8') as f:
+            json.dump({'fans': paliers[-1], 'workers': args.workers, 'routes': resume}, f, indent=2)
+        print(f"💾 Référence écrite dans {args.enregistrer}")
+
+    if args.reference:
+        with open(args.reference, encoding='utf-8') as f:
+            reference = json.load(f)
+        if reference.get('fans') != paliers[-1]:
+            print(f"⚠️  Référence mesurée à {reference.get('fans')} fans, dernier palier à {paliers[-1]}")
+        messages = regressions(resume, reference, args.tolerance)
+        for message in messages:
+            print(f"📉 Régression {message}")
+        if messages:
+            return 1
+        print(f"✅ Pas de régression par rapport à {args.reference} (tolérance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,13 @@
 
-import mysql.connector
 import csv
+import os
+import sys
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from depots import DepotEnCache, DepotMysql  # noqa: E402
 
 conn = mysql.connector.connect(
     host="localhost",
@@ -36,4 +43,16 @@ with open('statistiques_par_match.csv', mode='w', newline='', encoding='utf-8')
 
 print("Export terminé : statistiques_par_match.csv")
 cursor.close()
+
+# Classements par saison et de carrière : même calcul que le site (depots.py)
+depot = DepotEnCache(DepotMysql(conn))
+with open('classement_joueurs.csv', mode='w', newline='', encoding='utf-8') as f:
+    writer = csv.writer(f)
+    writer.writerow(['saison', 'rang', 'joueur', 'matchs', 'buts', 'passes', 'points'])
+    for saison in depot.saisons() + [None]:
+        for rang, (nom, stats) in enumerate(depot.classement(saison), 1):
+            writer.writerow([saison or 'carrière', rang, nom, stats['matchs'], stats['buts'],
+                             stats['passes'], stats['points']])
+
+print("Export terminé : classement_joueurs.csv")
 conn.close()
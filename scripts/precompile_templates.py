@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Précompile les templates Jinja dans le cache de bytecode (étape de build)
+Les Plombiers Hockey
+
+Chaque template est compilé une fois avec l'environnement Jinja de
+l'application et écrit dans TEMPLATE_CACHE_DIR : au démarrage, les workers
+gunicorn chargent le bytecode au lieu d'analyser index.html et les autres.
+L'application est importée avec INIT_DATABASE=false : le build ne crée ni
+base ni compte admin, et ne se connecte pas à la base de production.
+
+Usage: python scripts/precompile_templates.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['INIT_DATABASE'] = 'false'
+
+from app import app  # noqa: E402
+
+
+def main():
+    dossier = app.config['TEMPLATE_CACHE_DIR']
+    if not dossier:
+        print("TEMPLATE_CACHE_DIR est vide : cache de bytecode désactivé")
+        return 1
+    environnement = app.jinja_env
+    environnement.bytecode_cache.clear()
+    debut = time.perf_counter()
+    noms = environnement.list_templates()
+    for nom in noms:
+        environnement.get_template(nom)
+    print(f"✅ {len(noms)} templates compilés dans {dossier} "
+          f"en {(time.perf_counter() - debut) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Sauvegardes incrémentales de la base SQLite et des dossiers JSON
+Les Plombiers Hockey
+
+Chaque instantané est un petit fichier JSON (instantanes/<date>.json) qui
+associe chaque fichier sauvegardé à l'empreinte SHA-256 de son contenu.
+Les contenus sont rangés une seule fois, compressés, dans objets/ : un
+fichier qui n'a pas changé depuis la veille ne coûte ni lecture (taille et
+date de modification identiques à l'instantané précédent) ni octet de plus.
+
+La base est copiée avec l'API de sauvegarde de SQLite. En mode WAL la copie
+se fait d'un bloc dans une transaction de lecture, qui ne bloque pas les
+écritures; sinon elle avance par tranches de pages pour laisser passer les
+écritures entre deux tranches.
+
+Usage: python scripts/sauvegarde.py sauvegarder
+       python scripts/sauvegarde.py lister
+       python scripts/sauvegarde.py verifier [INSTANTANE]
+       python scripts/sauvegarde.py restaurer INSTANTANE [--cible DOSSIER]
+       python scripts/sauvegarde.py purger --garder 14
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.engine import make_url
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIERS_JSON = ('matchs', 'podiums')
+PAGES_PAR_TRANCHE = 256
+
+
+def chemin_base():
+    """Fichier SQLite de l'application, ou None pour une autre base.
+
+    Résolu comme Flask-SQLAlchemy : un chemin relatif part du dossier
+    instance/ de l'application, et sqlite:///file:...?uri=true est accepté.
+    """
+    url = make_url(os.environ.get('DATABASE_URL') or 'sqlite:///hockey_stats.db')
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return None
+    chemin = url.database[len('file:'):] if url.query.get('uri') else url.database
+    return chemin if os.path.isabs(chemin) else os.path.join(RACINE, 'instance', chemin)
+
+
+def fichiers_json(racine):
+    """[(chemin relatif, chemin)] des fichiers JSON de matchs/ et podiums/"""
+    trouves = []
+    for dossier in DOSSIERS_JSON:
+        for parent, _, noms in os.walk(os.path.join(racine, dossier)):
+            for nom in noms:
+                if nom.endswith('.json') and not nom.startswith('.tmp_'):
+                    chemin = os.path.join(parent, nom)
+                    trouves.append((os.path.relpath(chemin, racine).replace(os.sep, '/'), chemin))
+    return trouves
+
+
+class Depot:
+    """Dossier de sauvegarde : objets/ (contenus) et instantanes/ (index)"""
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.objets = os.path.join(dossier, 'objets')
+        self.instantanes = os.path.join(dossier, 'instantanes')
+        os.makedirs(self.objets, exist_ok=True)
+        os.makedirs(self.instantanes, exist_ok=True)
+
+    def chemin_objet(self, sha256):
+        return os.path.join(self.objets, sha256[:2], sha256[2:] + '.gz')
+
+    def ranger(self, chemin):
+        """Range le contenu d'un fichier s'il est nouveau. Retourne (sha256, ajouté)"""
+        empreinte = hashlib.sha256()
+        with open(chemin, 'rb') as f:
+            for bloc in iter(lambda: f.read(1 << 20), b''):
+                empreinte.update(bloc)
+        sha256 = empreinte.hexdigest()
+        cible = self.chemin_objet(sha256)
+        if os.path.exists(cible):
+            return sha256, False
+        os.makedirs(os.path.dirname(cible), exist_ok=True)
+        temporaire = cible + '.tmp'
+        with open(chemin, 'rb') as source, gzip.open(temporaire, 'wb', compresslevel=6) as destination:
+            shutil.copyfileobj(source, destination)
+        os.replace(temporaire, cible)
+        return sha256, True
+
+    def extraire(self, sha256, destination):
+        """Restaure un contenu de façon atomique et vérifie son empreinte"""
+        os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+        temporaire = destination + '.restauration'
+        empreinte = hashlib.sha256()
+        with gzip.open(self.chemin_objet(sha256), 'rb') as source, open(temporaire, 'wb') as f:
+            for bloc in iter(lambda: source.read(1 << 20), b''):
+                empreinte.update(bloc)
+                f.write(bloc)
+        if empreinte.hexdigest() != sha256:
+            os.remove(temporaire)
+            raise ValueError(f"Objet {sha256} corrompu")
+        os.replace(temporaire, destination)
+
+    def noms(self):
+        return sorted(n[:-5] for n in os.listdir(self.instantanes) if n.endswith('.json'))
+
+    def lire(self, nom):
+        with open(os.path.join(self.instantanes, nom + '.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def ecrire(self, nom, instantane):
+        chemin = os.path.join(self.instantanes, nom + '.json')
+        with open(chemin + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(instantane, f, indent=2, ensure_ascii=False)
+        os.replace(chemin + '.tmp', chemin)
+
+
+def copier_base(source, destination):
+    """Copie cohérente d'une base SQLite en service"""
+    connexion = sqlite3.connect(source, timeout=30)
+    copie = sqlite3.connect(destination)
+    try:
+        mode = connexion.execute('PRAGMA journal_mode').fetchone()[0].lower()
+        pages = -1 if mode == 'wal' else PAGES_PAR_TRANCHE
+        connexion.backup(copie, pages=pages, sleep=0.005)
+    finally:
+        copie.close()
+        connexion.close()
+
+
+def sauvegarder(depot, racine=RACINE):
+    debut = time.perf_counter()
+    precedent = depot.lire(depot.noms()[-1]) if depot.noms() else {'fichiers': {}}
+    fichiers, ajoutes, relus = {}, 0, 0
+
+    for relatif, chemin in fichiers_json(racine):
+        infos = os.stat(chemin)
+        ancien = precedent['fichiers'].get(relatif)
+        # Même taille et même date : le contenu n'a pas à être relu.
+        if (ancien and ancien['taille'] == infos.st_size and ancien['mtime_ns'] == infos.st_mtime_ns
+                and os.path.exists(depot.chemin_objet(ancien['sha256']))):
+            fichiers[relatif] = ancien
+            continue
+        sha256, ajoute = depot.ranger(chemin)
+        relus += 1
+        ajoutes += ajoute
+        fichiers[relatif] = {'sha256': sha256, 'taille': infos.st_size, 'mtime_ns': infos.st_mtime_ns}
+
+    base = None
+    source = chemin_base()
+    if source and not os.path.exists(source):
+        # Une base configurée mais introuvable ne doit pas donner un instantané sans base.
+        raise FileNotFoundError(f"Base SQLite introuvable : {source} (voir DATABASE_URL)")
+    if source:
+        with tempfile.TemporaryDirectory() as temporaire:
+            copie = os.path.join(temporaire, 'base.db')
+            copier_base(source, copie)
+            sha256, ajoute = depot.ranger(copie)
+            ajoutes += ajoute
+            base = {'fichier': os.path.basename(source), 'sha256': sha256, 'taille': os.path.getsize(copie)}
+
+    nom = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    depot.ecrire(nom, {'date': nom, 'base': base, 'fichiers': fichiers})
+    print(f"✅ Instantané {nom} : {len(fichiers)} fichiers ({relus} relus), "
+          f"{'base incluse' if base else 'sans base SQLite'}, {ajoutes} nouveaux objets, "
+          f"{(time.perf_counter() - debut):.2f} s")
+    return nom
+
+
+def verifier(depot, nom):
+    """Vérifie les objets d'un instantané; retourne la liste des anomalies"""
+    instantane = depot.lire(nom)
+    anomalies = []
+    references = dict((chemin, infos['sha256']) for chemin, infos in instantane['fichiers'].items())
+    if instantane['base']:
+        references['<base>'] = instantane['base']['sha256']
+    with tempfile.TemporaryDirectory() as temporaire:
+        for chemin, sha256 in sorted(references.items()):
+            cible = os.path.join(temporaire, 'objet')
+            try:
+                depot.extraire(sha256, cible)
+            except (OSError, ValueError, EOFError) as e:
+                anomalies.append(f"{chemin} : {e}")
+                continue
+            if chemin == '<base>':
+                connexion = sqlite3.connect(cible)
+                resultat = connexion.execute('PRAGMA integrity_check').fetchone()[0]
+                connexion.close()
+                if resultat != 'ok':
+                    anomalies.append(f"base : {resultat}")
+    return anomalies
+
+
+def restaurer(depot, nom, cible=RACINE):
+    instantane = depot.lire(nom)
+    for relatif, infos in instantane['fichiers'].items():
+        depot.extraire(infos['sha256'], os.path.join(cible, relatif))
+    # Les JSON créés après l'instantané disparaissent aussi : sinon un match
+    # ajouté depuis resterait à côté d'un manifeste qui l'ignore.
+    supprimes = 0
+    for relatif, chemin in fichiers_json(cible):
+        if relatif not in instantane['fichiers']:
+            os.remove(chemin)
+            supprimes += 1
+    for dossier in DOSSIERS_JSON:
+        for parent, _, _ in os.walk(os.path.join(cible, dossier), topdown=False):
+            if parent != os.path.join(cible, dossier) and not os.listdir(parent):
+                os.rmdir(parent)
+    if instantane['base']:
+        destination = os.path.join(cible, instantane['base']['fichier'])
+        if cible == RACINE and chemin_base():
+            destination = chemin_base()
+        with tempfile.TemporaryDirectory() as temporaire:
+            copie = os.path.join(temporaire, 'base.db')
+            depot.extraire(instantane['base']['sha256'], copie)
+            # Par l'API de sauvegarde plutôt qu'en écrasant le fichier, pour
+            # que les fichiers -wal/-shm d'une base ouverte restent cohérents.
+            copier_base(copie, destination)
+    print(f"♻️  Instantané {nom} restauré dans {cible} ({len(instantane['fichiers'])} fichiers, "
+          f"{supprimes} supprimés{', base incluse' if instantane['base'] else ''})")
+
+
+def purger(depot, garder):
+    """Garde les `garder` derniers instantanés et supprime les objets orphelins"""
+    noms = depot.noms()
+    for nom in noms[:-garder] if garder else noms:
+        os.remove(os.path.join(depot.instantanes, nom + '.json'))
+    utilises = set()
+    for nom in depot.noms():
+        instantane = depot.lire(nom)
+        utilises.update(infos['sha256'] for infos in instantane['fichiers'].values())
+        if instantane['base']:
+            utilises.add(instantane['base']['sha256'])
+    supprimes = 0
+    for parent, _, fichiers in os.walk(depot.objets):
+        for fichier in fichiers:
+            if os.path.basename(parent) + fichier[:-3] not in utilises:
+                os.remove(os.path.join(parent, fichier))
+                supprimes += 1
+    print(f"🧹 {len(depot.noms())} instantanés gardés, {supprimes} objets supprimés")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('commande', choices=('sauvegarder', 'lister', 'verifier', 'restaurer', 'purger'))
+    parser.add_argument('instantane', nargs='?')
+    parser.add_argument('--depot', default=os.environ.get('BACKUP_DIR', os.path.join(RACINE, 'backups')))
+    parser.add_argument('--cible', default=RACINE)
+    parser.add_argument('--garder', type=int, default=14)
+    args = parser.parse_args()
+
+    depot = Depot(args.depot)
+    if args.commande == 'sauvegarder':
+        try:
+            sauvegarder(depot)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return 1
+    elif args.commande == 'lister':
+        for nom in depot.noms():
+            instantane = depot.lire(nom)
+            print(f"{nom}  {len(instantane['fichiers'])} fichiers  {'base' if instantane['base'] else '-'}")
+    elif args.commande == 'verifier':
+        noms = [args.instantane] if args.instantane else depot.noms()
+        erreurs = 0
+        for nom in noms:
+            anomalies = verifier(depot, nom)
+            erreurs += len(anomalies)
+            print(f"{'❌' if anomalies else '✅'} {nom}")
+            for anomalie in anomalies:
+                print(f"   - {anomalie}")
+        return 1 if erreurs else 0
+    elif args.commande == 'restaurer':
+        if not args.instantane:
+            parser.error("restaurer demande le nom d'un instantané (voir 'lister')")
+        restaurer(depot, args.instantane, os.path.abspath(args.cible))
+    elif args.commande == 'purger':
+        purger(depot, args.garder)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
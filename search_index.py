@@ -0,0 +1,150 @@
+"""
+Index plein texte des joueurs et des nouvelles
+Les Plombiers Hockey
+
+SQLite : table virtuelle FTS5. PostgreSQL : colonne tsvector + index GIN.
+Le texte est replié sans accents avant l'indexation et dans les requêtes,
+pour que « Remillard » trouve « Rémillard » sur les deux moteurs sans
+dépendre de l'extension unaccent.
+
+Sous FTS5, kind et ref_id ne sont pas indexés : chaque document prend donc
+le rowid ref_id * len(KINDS) + rang de kind, et le retirer est une lecture
+par clé au lieu d'un parcours de tout l'index.
+"""
+
+import re
+import unicodedata
+
+from sqlalchemy import text
+
+TABLE = 'search_index'
+KINDS = ('player', 'news')
+
+_MOT = re.compile(r'\w+', re.UNICODE)
+
+
+def replier(texte):
+    """Minuscules sans accents : 'Gémus' -> 'gemus'"""
+    if not texte:
+        return ''
+    decompose = unicodedata.normalize('NFKD', texte)
+    return ''.join(c for c in decompose if not unicodedata.combining(c)).lower()
+
+
+def _moteur(connexion):
+    return connexion.dialect.name
+
+
+def _rowid(kind, ref_id):
+    return int(ref_id) * len(KINDS) + KINDS.index(kind)
+
+
+def creer_index(connexion):
+    """Crée la structure d'index si elle n'existe pas"""
+    moteur = _moteur(connexion)
+    if moteur == 'sqlite':
+        connexion.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        # Un index écrit avant les rowid calculés est vidé une fois; l'appelant
+        # le reconstruit en le trouvant vide.
+        rangs = ' '.join(f"WHEN '{kind}' THEN {rang}" for rang, kind in enumerate(KINDS))
+        ancien = connexion.execute(text(
+            f"SELECT 1 FROM {TABLE} WHERE rowid != ref_id * {len(KINDS)} + CASE kind {rangs} END LIMIT 1"
+        )).first()
+        if ancien:
+            vider(connexion)
+    elif moteur == 'postgresql':
+        connexion.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            "kind VARCHAR(10) NOT NULL, ref_id INTEGER NOT NULL, "
+            "title TEXT, body TEXT, document TSVECTOR, "
+            "PRIMARY KEY (kind, ref_id))"
+        ))
+        connexion.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_document ON {TABLE} USING GIN (document)"
+        ))
+    else:
+        connexion.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            "kind VARCHAR(10) NOT NULL, ref_id INTEGER NOT NULL, "
+            "title TEXT, body TEXT, PRIMARY KEY (kind, ref_id))"
+        ))
+
+
+def retirer(connexion, kind, ref_id):
+    if _moteur(connexion) == 'sqlite':
+        connexion.execute(text(f"DELETE FROM {TABLE} WHERE rowid = :rowid"), {'rowid': _rowid(kind, ref_id)})
+    else:
+        connexion.execute(text(f"DELETE FROM {TABLE} WHERE kind = :kind AND ref_id = :ref_id"),
+                          {'kind': kind, 'ref_id': ref_id})
+
+
+def indexer(connexion, kind, ref_id, titre, *champs):
+    """Ajoute ou remplace un document dans l'index"""
+    retirer(connexion, kind, ref_id)
+    params = {
+        'kind': kind,
+        'ref_id': ref_id,
+        'title': replier(titre),
+        'body': replier(' '.join(c for c in champs if c)),
+    }
+    moteur = _moteur(connexion)
+    if moteur == 'sqlite':
+        params['rowid'] = _rowid(kind, ref_id)
+        connexion.execute(text(
+            f"INSERT INTO {TABLE} (rowid, kind, ref_id, title, body) VALUES (:rowid, :kind, :ref_id, :title, :body)"
+        ), params)
+    elif moteur == 'postgresql':
+        connexion.execute(text(
+            f"INSERT INTO {TABLE} (kind, ref_id, title, body, document) VALUES "
+            "(:kind, :ref_id, :title, :body, "
+            "setweight(to_tsvector('simple', :title), 'A') || setweight(to_tsvector('simple', :body), 'B'))"
+        ), params)
+    else:
+        connexion.execute(text(
+            f"INSERT INTO {TABLE} (kind, ref_id, title, body) VALUES (:kind, :ref_id, :title, :body)"
+        ), params)
+
+
+def vider(connexion):
+    connexion.execute(text(f"DELETE FROM {TABLE}"))
+
+
+def compter(connexion):
+    return connexion.execute(text(f"SELECT COUNT(*) FROM {TABLE}")).scalar()
+
+
+def rechercher(connexion, requete, kind=None, limite=20):
+    """Retourne [(kind, ref_id)] par pertinence; chaque mot est un préfixe"""
+    mots = _MOT.findall(replier(requete))
+    if not mots:
+        return []
+
+    moteur = _moteur(connexion)
+    params = {'limite': limite}
+    filtre_kind = ''
+    if kind:
+        filtre_kind = ' AND kind = :kind'
+        params['kind'] = kind
+
+    if moteur == 'sqlite':
+        params['requete'] = ' '.join(f'"{mot}"*' for mot in mots)
+        sql = (f"SELECT kind, ref_id FROM {TABLE} WHERE {TABLE} MATCH :requete{filtre_kind} "
+               f"ORDER BY bm25({TABLE}, 0, 0, 10.0, 1.0) LIMIT :limite")
+    elif moteur == 'postgresql':
+        params['requete'] = ' & '.join(f'{mot}:*' for mot in mots)
+        sql = (f"SELECT kind, ref_id FROM {TABLE} "
+               f"WHERE document @@ to_tsquery('simple', :requete){filtre_kind} "
+               f"ORDER BY ts_rank(document, to_tsquery('simple', :requete)) DESC LIMIT :limite")
+    else:
+        conditions = []
+        for i, mot in enumerate(mots):
+            params[f'mot{i}'] = f'%{mot}%'
+            conditions.append(f"(title LIKE :mot{i} OR body LIKE :mot{i})")
+        sql = (f"SELECT kind, ref_id FROM {TABLE} WHERE {' AND '.join(conditions)}{filtre_kind} "
+               f"LIMIT :limite")
+
+    return [(row[0], int(row[1])) for row in connexion.execute(text(sql), params)]